@@ -0,0 +1,144 @@
+import numpy as np
+
+try:
+    from .jit import njit
+except ImportError:
+    from jit import njit
+
+
+@njit(cache=True)
+def bfs_levels(indptr, indices, cap, flow, source, sink, level, queue):
+    """
+    Breadth-First Search that builds the level graph of the residual graph.
+    level[v] is the distance from source to v, or -1 if v is unreachable.
+
+    Args:
+        indptr: CSR row pointers, arcs of node u are indptr[u]:indptr[u + 1].
+        indices: Head node of each arc.
+        cap: Capacity of each arc.
+        flow: Current flow of each arc.
+        source: Index of the source node.
+        sink: Index of the sink node.
+        level: Preallocated int32 buffer of length V.
+        queue: Preallocated int32 buffer of length V.
+    Returns:
+        bool: True if the sink is reachable from the source, False otherwise.
+    """
+    level[:] = -1
+    level[source] = 0
+    queue[0] = source
+    head, tail = 0, 1
+
+    while head < tail:
+        current_node = queue[head]
+        head += 1
+
+        for k in range(indptr[current_node], indptr[current_node + 1]):
+            neighbor = indices[k]
+            if level[neighbor] < 0 and cap[k] - flow[k] > 0:
+                level[neighbor] = level[current_node] + 1
+                queue[tail] = neighbor
+                tail += 1
+
+    return level[sink] >= 0
+
+
+@njit(cache=True)
+def send(indptr, indices, cap, rev, flow, source, sink, level, iter_ptr, path):
+    """
+    Sends a blocking flow through the level graph.
+
+    The DFS is iterative: path[] holds the arcs from the source to the current
+    node. iter_ptr[u] is the current arc of u, it only moves forward, so every
+    arc is examined O(1) times per phase. Dead-end nodes are dropped from the
+    level graph.
+
+    Returns:
+        The amount of flow sent in this phase.
+    """
+    pushed = 0
+    depth = 0
+    current_node = source
+
+    while True:
+        if current_node == sink:
+            # Find the bottleneck of the path and augment along it
+            path_flow = cap[path[0]] - flow[path[0]]
+            for i in range(1, depth):
+                k = path[i]
+                path_flow = min(path_flow, cap[k] - flow[k])
+            for i in range(depth):
+                k = path[i]
+                flow[k] += path_flow
+                flow[rev[k]] -= path_flow
+            pushed += path_flow
+
+            # Saturated arcs are skipped by the cursors on the next descent
+            depth = 0
+            current_node = source
+            continue
+
+        advanced = False
+        while iter_ptr[current_node] < indptr[current_node + 1]:
+            k = iter_ptr[current_node]
+            neighbor = indices[k]
+            if level[neighbor] == level[current_node] + 1 and cap[k] - flow[k] > 0:
+                path[depth] = k
+                depth += 1
+                current_node = neighbor
+                advanced = True
+                break
+            iter_ptr[current_node] += 1
+
+        if not advanced:
+            if depth == 0:
+                return pushed
+            # Dead end: remove the node from the level graph and retreat
+            level[current_node] = -1
+            depth -= 1
+            current_node = indices[rev[path[depth]]]
+            iter_ptr[current_node] += 1
+
+
+@njit(cache=True)
+def _dinic(indptr, indices, cap, rev, flow, source, sink):
+    """
+    Runs blocking-flow phases in place and returns the flow value.
+    """
+    num_nodes = indptr.shape[0] - 1
+    level = np.empty(num_nodes, dtype=np.int32)
+    iter_ptr = np.empty(num_nodes, dtype=np.int32)
+    queue = np.empty(num_nodes, dtype=np.int32)
+    path = np.empty(num_nodes, dtype=np.int32)
+    max_flow = 0
+
+    if source == sink:
+        return max_flow
+
+    while bfs_levels(indptr, indices, cap, flow, source, sink, level, queue):
+        iter_ptr[:] = indptr[:-1]
+        max_flow += send(
+            indptr, indices, cap, rev, flow, source, sink, level, iter_ptr, path
+        )
+
+    return max_flow
+
+
+def dinic(indptr, indices, cap, rev, source, sink):
+    """
+    Implements Dinic's algorithm to find the maximum flow from source to sink.
+
+    Args:
+        indptr: CSR row pointers of the residual graph.
+        indices: Head node of each arc.
+        cap: Capacity of each arc.
+        rev: Index of the twin (reverse) arc of each arc.
+        source: Index of the source node.
+        sink: Index of the sink node.
+    Returns:
+        dict: The value of the maximum flow and the flow of each arc.
+    """
+    flow = np.zeros_like(cap)
+    max_flow = _dinic(indptr, indices, cap, rev, flow, source, sink)
+
+    return {"max_flow": int(max_flow), "flow": flow}
@@ -1,3 +1,5 @@
+from collections import defaultdict
+
 import networkx as nx
 import matplotlib.pyplot as plt
 
@@ -16,48 +18,27 @@ def draw_network_load_graph(G, flow_dict, pos, sources, stores):
     """
     fig, ax = plt.subplots(figsize=(14, 10))
 
-    # Pre-calculate proportional flows for stores
-    # For each warehouse, distribute its outgoing flow proportionally to child stores
-    store_proportional_flows = {}
-
-    warehouses = [node for node in G.nodes() if node.startswith("Warehouse")]
-
-    for warehouse in warehouses:
-        # Get outgoing flow from this warehouse
-        warehouse_outflow = sum(
-            flow_dict.get(warehouse, {}).get(succ, 0)
-            for succ in G.successors(warehouse)
-        )
-
-        # Get child stores and their capacities
-        child_stores = list(G.successors(warehouse))
-
-        if child_stores and warehouse_outflow > 0:
-            # Calculate total capacity of child stores
-            total_child_capacity = sum(
-                sum(G[pred][store]["capacity"] for pred in G.predecessors(store))
-                for store in child_stores
-            )
-
-            # Distribute warehouse flow proportionally to each store
-            for store in child_stores:
-                store_capacity = sum(
-                    G[pred][store]["capacity"] for pred in G.predecessors(store)
-                )
-
-                if total_child_capacity > 0:
-                    # Proportional share of this warehouse's flow
-                    proportion = store_capacity / total_child_capacity
-                    proportional_flow = warehouse_outflow * proportion
-
-                    if store not in store_proportional_flows:
-                        store_proportional_flows[store] = 0
-                    store_proportional_flows[store] += proportional_flow
+    # Cache adjacency, capacities and flows once instead of walking the
+    # NetworkX views again for every node and edge
+    pred = {node: list(G.predecessors(node)) for node in G}
+    cap = {}
+
+    # Per-node capacity and flow totals in a single pass over the edges
+    out_capacity = defaultdict(int)
+    inflow = defaultdict(int)
+    outflow = defaultdict(int)
+    for u, v, capacity in G.edges(data="capacity"):
+        cap[u, v] = capacity
+        out_capacity[u] += capacity
+        flow = flow_dict.get(u, {}).get(v, 0)
+        outflow[u] += flow
+        inflow[v] += flow
 
     # Calculate node loads
     node_colors = []
     node_sizes = []
     node_labels_with_load = {}
+    node_load_percent = {}
 
     # Get all nodes except super source/sink
     regular_nodes = [
@@ -65,51 +46,15 @@ def draw_network_load_graph(G, flow_dict, pos, sources, stores):
     ]
 
     for node in regular_nodes:
-        # Calculate incoming flow
-        incoming_flow = sum(
-            flow_dict.get(pred, {}).get(node, 0) for pred in G.predecessors(node)
-        )
-
-        # Calculate outgoing flow
-        outgoing_flow = sum(
-            flow_dict.get(node, {}).get(succ, 0) for succ in G.successors(node)
-        )
-
-        # For stores: use proportional flow distributed from parent warehouse
-        # For others: use actual flow
-        if node in stores:
-            actual_flow = store_proportional_flows.get(node, 0)
-        else:
-            actual_flow = max(incoming_flow, outgoing_flow)
-
-        # Calculate capacity based on node type
-        if node in sources:
-            # For terminals: capacity is sum of outgoing edges
-            capacity = sum(G[node][succ]["capacity"] for succ in G.successors(node))
-        elif node in stores:
-            # For stores: capacity is the edge capacity from parent warehouse
-            parent_warehouses = list(G.predecessors(node))
-            if parent_warehouses:
-                parent_warehouse = parent_warehouses[0]
-                capacity = G[parent_warehouse][node]["capacity"]
-            else:
-                capacity = 1
-        else:
-            # For warehouses: capacity is sum of outgoing edges
-            capacity = sum(G[node][succ]["capacity"] for succ in G.successors(node))
-
         # Calculate load percentage
         if node in stores:
             # For stores: percentage = edge_capacity_to_store / sum_of_all_edge_capacities_from_warehouse
-            parent_warehouses = list(G.predecessors(node))
+            parent_warehouses = pred[node]
             if parent_warehouses:
                 parent_warehouse = parent_warehouses[0]
-                edge_capacity_to_store = G[parent_warehouse][node]["capacity"]
+                edge_capacity_to_store = cap[parent_warehouse, node]
                 # Get total edge capacity from parent warehouse
-                total_warehouse_capacity = sum(
-                    G[parent_warehouse][succ]["capacity"]
-                    for succ in G.successors(parent_warehouse)
-                )
+                total_warehouse_capacity = out_capacity[parent_warehouse]
                 load_percent = (
                     (edge_capacity_to_store / total_warehouse_capacity * 100)
                     if total_warehouse_capacity > 0
@@ -119,8 +64,13 @@ def draw_network_load_graph(G, flow_dict, pos, sources, stores):
                 load_percent = 0
         else:
             # For terminals and warehouses: percentage = actual_flow / capacity
+            # where capacity is the sum of outgoing edges
+            actual_flow = max(inflow[node], outflow[node])
+            capacity = out_capacity[node]
             load_percent = (actual_flow / capacity * 100) if capacity > 0 else 0
 
+        node_load_percent[node] = load_percent
+
         # Create label with node name and load percentage
         node_labels_with_load[node] = f"{node}\n({load_percent:.1f}%)"
 
@@ -139,29 +89,28 @@ def draw_network_load_graph(G, flow_dict, pos, sources, stores):
 
     # Draw edges with arrows and offset from node center
     from matplotlib.patches import FancyArrowPatch
-    import matplotlib.patches as mpatches
 
-    for u, v in G.edges():
-        if u in ["SUPER_SOURCE", "SUPER_SINK"] or v in ["SUPER_SOURCE", "SUPER_SINK"]:
-            continue
-
-        x1, y1 = pos[u]
-        x2, y2 = pos[v]
+    arrow_style = {
+        "arrowstyle": "-|>",
+        "color": "gray",
+        "linewidth": 2.5,
+        "mutation_scale": 30,
+        "shrinkA": 30,  # Offset from source node center
+        "shrinkB": 30,  # Offset from destination node center
+        "connectionstyle": "arc3,rad=0.05",
+        "zorder": 0,
+    }
+    arrows = [
+        FancyArrowPatch(pos[u], pos[v], **arrow_style)
+        for u, v in G.edges()
+        if u not in ["SUPER_SOURCE", "SUPER_SINK"]
+        and v not in ["SUPER_SOURCE", "SUPER_SINK"]
+    ]
 
-        # Create arrow with offset from nodes
-        arrow = FancyArrowPatch(
-            (x1, y1),
-            (x2, y2),
-            arrowstyle="-|>",
-            color="gray",
-            linewidth=2.5,
-            mutation_scale=30,
-            shrinkA=30,  # Offset from source node center
-            shrinkB=30,  # Offset from destination node center
-            connectionstyle="arc3,rad=0.05",
-            zorder=0,
-        )
-        ax.add_patch(arrow)
+    # Arrows run between nodes, so the node scatter already sets the data
+    # limits; add_artist() skips the per-patch limit update of add_patch()
+    for arrow in arrows:
+        ax.add_artist(arrow)
 
     # Draw nodes with calculated colors and sizes
     node_collection = nx.draw_networkx_nodes(
@@ -180,100 +129,25 @@ def draw_network_load_graph(G, flow_dict, pos, sources, stores):
         G, pos, labels=node_labels_with_load, ax=ax, font_size=9, font_weight="bold"
     )
 
-    # Calculate load percentages for all nodes first (reuse logic)
-    node_load_percent = {}
-
-    for node in regular_nodes:
-        # Calculate incoming flow
-        incoming_flow = sum(
-            flow_dict.get(pred, {}).get(node, 0) for pred in G.predecessors(node)
-        )
-
-        # Calculate outgoing flow
-        outgoing_flow = sum(
-            flow_dict.get(node, {}).get(succ, 0) for succ in G.successors(node)
-        )
-
-        # For stores: use proportional flow distributed from parent warehouse
-        # For others: use actual flow
-        if node in stores:
-            actual_flow = store_proportional_flows.get(node, 0)
-        else:
-            actual_flow = max(incoming_flow, outgoing_flow)
-
-        # Calculate capacity based on node type
-        if node in sources:
-            # For terminals: capacity is sum of outgoing edges
-            capacity = sum(G[node][succ]["capacity"] for succ in G.successors(node))
-        elif node in stores:
-            # For stores: capacity is the edge capacity from parent warehouse
-            parent_warehouses = list(G.predecessors(node))
-            if parent_warehouses:
-                parent_warehouse = parent_warehouses[0]
-                capacity = G[parent_warehouse][node]["capacity"]
-            else:
-                capacity = 1
-        else:
-            # For warehouses: capacity is sum of outgoing edges
-            capacity = sum(G[node][succ]["capacity"] for succ in G.successors(node))
-
-        # Calculate load percentage
-        if node in stores:
-            # For stores: percentage = edge_capacity_to_store / sum_of_all_edge_capacities_from_warehouse
-            parent_warehouses = list(G.predecessors(node))
-            if parent_warehouses:
-                parent_warehouse = parent_warehouses[0]
-                edge_capacity_to_store = G[parent_warehouse][node]["capacity"]
-                # Get total edge capacity from parent warehouse
-                total_warehouse_capacity = sum(
-                    G[parent_warehouse][succ]["capacity"]
-                    for succ in G.successors(parent_warehouse)
-                )
-                load_percent = (
-                    (edge_capacity_to_store / total_warehouse_capacity * 100)
-                    if total_warehouse_capacity > 0
-                    else 0
-                )
-            else:
-                load_percent = 0
-        else:
-            # For terminals and warehouses: percentage = actual_flow / capacity
-            load_percent = (actual_flow / capacity * 100) if capacity > 0 else 0
-
-        node_load_percent[node] = load_percent
-
     # Draw edge labels (capacities with actual flow from flow_dict)
-    edge_labels = {}
-    for u, v in G.edges():
-        if u in ["SUPER_SOURCE", "SUPER_SINK"] or v in ["SUPER_SOURCE", "SUPER_SINK"]:
-            continue
-
-        capacity = G[u][v]["capacity"]
-
-        # For edges to stores: show proportional allocation of warehouse flow
+    def edge_flow(u, v):
+        # For edges to stores: show proportional allocation of the warehouse
+        # (u) actual outflow, using the per-node totals cached above
         if v in stores:
-            # Get the warehouse (u) actual outflow
-            warehouse_actual_flow = sum(
-                flow_dict.get(u, {}).get(succ, 0) for succ in G.successors(u)
-            )
-
-            # Get total warehouse capacity
-            total_warehouse_capacity = sum(
-                G[u][succ]["capacity"] for succ in G.successors(u)
-            )
-
-            # Calculate proportional flow to this store
+            total_warehouse_capacity = out_capacity[u]
             if total_warehouse_capacity > 0:
-                proportion = capacity / total_warehouse_capacity
-                flow_on_edge = warehouse_actual_flow * proportion
-            else:
-                flow_on_edge = 0
-        else:
-            # For other edges: use actual flow from flow_dict
-            flow_on_edge = flow_dict.get(u, {}).get(v, 0)
-
-        # Format: "capacity [flow]"
-        edge_labels[(u, v)] = f"{int(capacity)} [{int(round(flow_on_edge))}]"
+                return outflow[u] * (cap[u, v] / total_warehouse_capacity)
+            return 0
+        # For other edges: use actual flow from flow_dict
+        return flow_dict.get(u, {}).get(v, 0)
+
+    # Each label shows the capacity followed by the flow in brackets
+    edge_labels = {
+        (u, v): f"{int(capacity)} [{int(round(edge_flow(u, v)))}]"
+        for (u, v), capacity in cap.items()
+        if u not in ["SUPER_SOURCE", "SUPER_SINK"]
+        and v not in ["SUPER_SOURCE", "SUPER_SINK"]
+    }
 
     nx.draw_networkx_edge_labels(G, pos, edge_labels=edge_labels, ax=ax, font_size=8)
 
@@ -1,87 +1,229 @@
-from collections import deque
+from array import array
 
+import numpy as np
 
-def bfs(capacity_matrix, flow_matrix, source, sink, parent):
+try:
+    from .jit import HAS_NUMBA, njit
+except ImportError:
+    from jit import HAS_NUMBA, njit
+
+
+@njit(cache=True)
+def bfs(
+    indptr,
+    indices,
+    cap,
+    rev,
+    flow,
+    source,
+    sink,
+    parent_edge,
+    child_edge,
+    visited,
+    queue,
+    queue_back,
+):
     """
-    Breadth-First Search to find an augmenting path in the residual graph.
-    Returns True if there is a path from source to sink in residual graph.
-    Also fills parent[] to store the path.
+    Bidirectional Breadth-First Search for an augmenting path in the residual graph.
+    One search grows from the source over arcs with residual capacity, the
+    other from the sink over the twins of such arcs, and the smaller frontier
+    is expanded one level at a time until the two meet. On the layered
+    terminal -> warehouse -> store networks this visits far fewer nodes than
+    a single search from the source.
 
     Args:
-        capacity_matrix: 2D list representing the capacity of each edge.
-        flow_matrix: 2D list representing the current flow of each edge.
+        indptr: CSR row pointers, arcs of node u are indptr[u]:indptr[u + 1].
+        indices: Head node of each arc.
+        cap: Capacity of each arc.
+        rev: Index of the twin (reverse) arc of each arc.
+        flow: Current flow of each arc.
         source: Index of the source node.
         sink: Index of the sink node.
-        parent: List to store the path.
+        parent_edge: Arc used to reach each node of the source side.
+        child_edge: Arc leaving each node of the sink side towards the sink.
+        visited: Preallocated byte buffer of length V, all zeros on entry,
+            1 marks the source side and 2 the sink side.
+        queue: Preallocated int32 buffer of length V for the source side.
+        queue_back: Preallocated int32 buffer of length V for the sink side.
     Returns:
-        bool: True if there is a path from source to sink, False otherwise.
+        int: The arc joining the two searches, or -1 if there is no path.
     """
-    visited = [False] * len(capacity_matrix)
-    queue = deque([source])
-    visited[source] = True
-
-    while queue:
-        current_node = queue.popleft()
-
-        for neighbor in range(len(capacity_matrix)):
-            # Check if there is residual capacity in the edge
-            if (
-                not visited[neighbor]
-                and capacity_matrix[current_node][neighbor]
-                - flow_matrix[current_node][neighbor]
-                > 0
-            ):
-                parent[neighbor] = current_node
-                visited[neighbor] = True
-                if neighbor == sink:
-                    return True
-                queue.append(neighbor)
-
-    return False
-
-
-def edmonds_karp(capacity_matrix, source, sink):
-    """
-    Implements the Edmonds-Karp algorithm to find the maximum flow from source to sink.
+    if source == sink:
+        return -1
 
-    Args:
-        capacity_matrix: 2D list representing the capacity of each edge.
-        source: Index of the source node.
-        sink: Index of the sink node.
-    Returns:
-        max_flow: The value of the maximum flow.
+    visited[source] = 1
+    visited[sink] = 2
+    queue[0] = source
+    queue_back[0] = sink
+    # Every node is enqueued at most once, so head/tail never pass V
+    head, tail = 0, 1
+    head_back, tail_back = 0, 1
+    meet = -1
+
+    while meet < 0 and head < tail and head_back < tail_back:
+        if tail - head <= tail_back - head_back:
+            # Expand one level of the source side
+            level_end = tail
+            while meet < 0 and head < level_end:
+                current_node = queue[head]
+                head += 1
+                for k in range(indptr[current_node], indptr[current_node + 1]):
+                    neighbor = indices[k]
+                    # Check if there is residual capacity in the arc
+                    if visited[neighbor] != 1 and cap[k] - flow[k] > 0:
+                        if visited[neighbor] == 2:
+                            meet = k
+                            break
+                        parent_edge[neighbor] = k
+                        visited[neighbor] = 1
+                        queue[tail] = neighbor
+                        tail += 1
+        else:
+            # Expand one level of the sink side, arc k is neighbor -> node
+            level_end = tail_back
+            while meet < 0 and head_back < level_end:
+                current_node = queue_back[head_back]
+                head_back += 1
+                for j in range(indptr[current_node], indptr[current_node + 1]):
+                    neighbor = indices[j]
+                    k = rev[j]
+                    if visited[neighbor] != 2 and cap[k] - flow[k] > 0:
+                        if visited[neighbor] == 1:
+                            meet = k
+                            break
+                        child_edge[neighbor] = k
+                        visited[neighbor] = 2
+                        queue_back[tail_back] = neighbor
+                        tail_back += 1
+
+    # Clear only the nodes marked in this search instead of the whole buffer
+    for i in range(tail):
+        visited[queue[i]] = 0
+    for i in range(tail_back):
+        visited[queue_back[i]] = 0
+
+    return meet
+
+
+@njit(cache=True)
+def _edmonds_karp(
+    indptr,
+    indices,
+    cap,
+    rev,
+    flow,
+    source,
+    sink,
+    parent_edge,
+    child_edge,
+    visited,
+    queue,
+    queue_back,
+    path_edges,
+):
+    """
+    Augments flow in place along shortest paths and returns the flow value.
     """
-    num_nodes = len(capacity_matrix)
-    flow_matrix = [
-        [0] * num_nodes for _ in range(num_nodes)
-    ]  # Initialize flow matrix with zeros
-    parent = [-1] * num_nodes
     max_flow = 0
 
     # While there is an augmenting path, add flow
-    while bfs(capacity_matrix, flow_matrix, source, sink, parent):
-        # Find the minimum residual capacity of the edges along the path found (bottleneck)
-        path_flow = float("Inf")
-        current_node = sink
+    while True:
+        meet = bfs(
+            indptr,
+            indices,
+            cap,
+            rev,
+            flow,
+            source,
+            sink,
+            parent_edge,
+            child_edge,
+            visited,
+            queue,
+            queue_back,
+        )
+        if meet < 0:
+            break
 
+        # Collect the arcs of the path found: back from the meeting arc to
+        # the source, the meeting arc itself, then forward to the sink
+        path_length = 0
+        current_node = indices[rev[meet]]
         while current_node != source:
-            previous_node = parent[current_node]
-            path_flow = min(
-                path_flow,
-                capacity_matrix[previous_node][current_node]
-                - flow_matrix[previous_node][current_node],
-            )
-            current_node = previous_node
+            k = parent_edge[current_node]
+            path_edges[path_length] = k
+            path_length += 1
+            current_node = indices[rev[k]]
+        path_edges[path_length] = meet
+        path_length += 1
+        current_node = indices[meet]
+        while current_node != sink:
+            k = child_edge[current_node]
+            path_edges[path_length] = k
+            path_length += 1
+            current_node = indices[k]
+        path = path_edges[:path_length]
+
+        # Find the minimum residual capacity of the arcs along the path (bottleneck)
+        path_flow = (cap[path] - flow[path]).min()
 
         # Update flow along the path, considering the reverse flow
-        current_node = sink
-        while current_node != source:
-            previous_node = parent[current_node]
-            flow_matrix[previous_node][current_node] += path_flow
-            flow_matrix[current_node][previous_node] -= path_flow
-            current_node = previous_node
+        flow[path] += path_flow
+        flow[rev[path]] -= path_flow
 
         # Increase the maximum flow
         max_flow += path_flow
 
-    return {"max_flow": max_flow, "flow_matrix": flow_matrix}
+    return max_flow
+
+
+def edmonds_karp(indptr, indices, cap, rev, source, sink):
+    """
+    Implements the Edmonds-Karp algorithm to find the maximum flow from source to sink.
+
+    Args:
+        indptr: CSR row pointers of the residual graph.
+        indices: Head node of each arc.
+        cap: Capacity of each arc.
+        rev: Index of the twin (reverse) arc of each arc.
+        source: Index of the source node.
+        sink: Index of the sink node.
+    Returns:
+        dict: The value of the maximum flow and the flow of each arc.
+    """
+    num_nodes = len(indptr) - 1
+    flow = np.zeros_like(cap)  # Initialize flow of every arc with zeros
+
+    # BFS and path buffers, allocated once per run and reused by every search
+    path_edges = np.empty(num_nodes, dtype=np.int32)
+    if HAS_NUMBA:
+        parent_edge = np.full(num_nodes, -1, dtype=np.int32)
+        child_edge = np.full(num_nodes, -1, dtype=np.int32)
+        visited = np.zeros(num_nodes, dtype=np.uint8)
+        queue = np.empty(num_nodes, dtype=np.int32)
+        queue_back = np.empty(num_nodes, dtype=np.int32)
+    else:
+        # Plain Python reads typed buffers faster than boxed NumPy scalars
+        parent_edge = array("i", [-1]) * num_nodes
+        child_edge = array("i", [-1]) * num_nodes
+        visited = bytearray(num_nodes)
+        queue = array("i", [0]) * num_nodes
+        queue_back = array("i", [0]) * num_nodes
+
+    max_flow = _edmonds_karp(
+        indptr,
+        indices,
+        cap,
+        rev,
+        flow,
+        source,
+        sink,
+        parent_edge,
+        child_edge,
+        visited,
+        queue,
+        queue_back,
+        path_edges,
+    )
+
+    return {"max_flow": int(max_flow), "flow": flow}
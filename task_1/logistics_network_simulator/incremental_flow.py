@@ -0,0 +1,132 @@
+from collections import deque
+
+
+def augment_to_max(G, flow, source, sink):
+    """
+    Augments an existing feasible flow in place until it is maximum.
+
+    Shortest augmenting paths (Edmonds-Karp) are searched in the residual
+    graph implied by G capacities and the flow, so a flow that is already
+    close to maximum needs only a few BFS passes.
+
+    Args:
+        G: NetworkX DiGraph with "capacity" on every edge
+        flow: Flow of every edge as nested dicts, flow[u][v], modified in place
+        source: Source node name
+        sink: Sink node name
+    Returns:
+        The amount of flow added.
+    """
+    added = 0
+    while True:
+        # parent[v] = (u, True) for a forward edge u -> v with spare
+        # capacity, (u, False) for an edge v -> u whose flow can be undone
+        parent = {source: None}
+        queue = deque([source])
+        while queue and sink not in parent:
+            u = queue.popleft()
+            for v, attrs in G.succ[u].items():
+                if v not in parent and attrs["capacity"] - flow[u][v] > 0:
+                    parent[v] = (u, True)
+                    queue.append(v)
+            for w in G.pred[u]:
+                if w not in parent and flow[w][u] > 0:
+                    parent[w] = (u, False)
+                    queue.append(w)
+
+        if sink not in parent:
+            return added
+
+        # Find the bottleneck of the path, then push it
+        path = []
+        node = sink
+        while parent[node] is not None:
+            prev, forward = parent[node]
+            path.append((prev, node, forward))
+            node = prev
+        path_flow = min(
+            G.succ[u][v]["capacity"] - flow[u][v] if forward else flow[v][u]
+            for u, v, forward in path
+        )
+        for u, v, forward in path:
+            if forward:
+                flow[u][v] += path_flow
+            else:
+                flow[v][u] -= path_flow
+        added += path_flow
+
+
+def cancel_flow(G, flow, start, end, amount):
+    """
+    Removes up to amount units of flow along paths from start to end.
+
+    Only edges that carry flow are followed, every found path is reduced by
+    its bottleneck until amount is reached or no such path is left.
+
+    Args:
+        G: NetworkX DiGraph
+        flow: Flow of every edge as nested dicts, modified in place
+        start: First node of the paths
+        end: Last node of the paths
+        amount: Maximum amount of flow to remove
+    Returns:
+        The amount of flow removed.
+    """
+    removed = 0
+    while removed < amount:
+        parent = {start: None}
+        queue = deque([start])
+        while queue and end not in parent:
+            u = queue.popleft()
+            for v in G.succ[u]:
+                if v not in parent and flow[u][v] > 0:
+                    parent[v] = u
+                    queue.append(v)
+
+        if end not in parent:
+            break
+
+        path = []
+        node = end
+        while parent[node] is not None:
+            path.append((parent[node], node))
+            node = parent[node]
+        path_flow = min(amount - removed, min(flow[u][v] for u, v in path))
+        for u, v in path:
+            flow[u][v] -= path_flow
+        removed += path_flow
+
+    return removed
+
+
+def shrink_edge_flow(G, flow, source, sink, u, v):
+    """
+    Restores a feasible flow after the capacity of u -> v was lowered.
+
+    The excess on u -> v is first removed from flow cycles through the edge
+    (paths v -> u), which keeps the flow value. What is left is cancelled
+    on paths source -> u and v -> sink, which lowers the flow value by the
+    same amount. Call augment_to_max() afterwards to make it maximum again.
+
+    Args:
+        G: NetworkX DiGraph, already holding the new capacity of u -> v
+        flow: Flow of every edge as nested dicts, modified in place
+        source: Source node name
+        sink: Sink node name
+        u: Tail of the changed edge
+        v: Head of the changed edge
+    Returns:
+        The amount by which the flow value dropped.
+    """
+    excess = flow[u][v] - G.succ[u][v]["capacity"]
+    if excess <= 0:
+        return 0
+
+    flow[u][v] -= excess
+    excess -= cancel_flow(G, flow, v, u, excess)
+    if excess > 0:
+        if u != source:
+            cancel_flow(G, flow, source, u, excess)
+        if v != sink:
+            cancel_flow(G, flow, v, sink, excess)
+    return excess
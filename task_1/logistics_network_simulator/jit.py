@@ -0,0 +1,40 @@
+"""
+Optional Numba support for the max-flow kernels.
+
+When Numba is not installed, njit() leaves the function untouched and the
+kernels run as plain Python over the same NumPy arrays.
+"""
+
+try:
+    from numba import njit as _numba_njit
+
+    HAS_NUMBA = True
+
+    def njit(*args, **kwargs):
+        """
+        numba.njit that keeps the on-disk cache to script-mode imports.
+
+        The simulator imports the kernels as top-level modules ("dinic"),
+        calculate_max_goods_flow as package modules. Numba keys its cache by
+        source file but pickles the module name, so both modes cannot share
+        one cache and only the top-level import writes and reads it.
+        """
+
+        def decorate(func):
+            options = dict(kwargs)
+            if "." in func.__module__:
+                options["cache"] = False
+            return _numba_njit(**options)(func)
+
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return decorate(args[0])
+        return decorate
+
+except ImportError:
+    HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        """No-op replacement for numba.njit, with or without arguments."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
@@ -3,22 +3,29 @@ Logistics Network Simulator - Interactive Console Application
 Manages and analyzes logistics networks with real-time edge capacity updates.
 """
 
+from bisect import bisect_left
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any
+
 import typer
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
 from rich.prompt import Prompt
+from rich.text import Text
 
 from data import edges, pos
 from build_graph import build_graph
 from draw_graph import draw_graph
 from draw_network_load_graph import draw_network_load_graph
 from utils import (
-    validate_edge,
-    update_edge_capacity,
+    set_edge_capacity,
     get_edge_autocomplete_list,
     get_current_state,
     calculate_network_max_flow,
+    calculate_network_max_flow_value,
+    csr_maximum_flow_value,
 )
 
 app = typer.Typer(
@@ -26,25 +33,69 @@ app = typer.Typer(
 )
 console = Console()
 
+# Visualization modes accepted by draw
+_DRAW_OPTS = frozenset(("basic", "load"))
+
+# Max number of max-flow results kept in NetworkState.flow_cache
+FLOW_CACHE_SIZE = 128
+
+
+@dataclass(slots=True)
+class NetworkState:
+    """Global state of the simulator, fields are slots instead of dict keys."""
+
+    graph: Any = None
+    original_edges: list | None = None
+    pos: dict = field(default_factory=lambda: pos)
+    sources: list = field(default_factory=lambda: ["Terminal 1", "Terminal 2"])
+    sinks: list = field(default_factory=lambda: [f"Store {i}" for i in range(1, 15)])
+    # Last result of get_current_state(), reset whenever capacities change
+    cached_state: dict | None = None
+    # Static Sources/Targets index tables, built once at startup
+    sources_table: Table | None = None
+    sinks_table: Table | None = None
+    # Sorted (lowercase name, name) pairs of all edges for prefix search
+    ac_sorted: list | None = None
+    # Bumped on every capacity change or rebuild, identifies cached results
+    capacity_version: int = 0
+    # LRU of solver results keyed by (source, sink, solver, capacity_version)
+    flow_cache: OrderedDict = field(default_factory=OrderedDict)
+
+
 # Global state - network initialized at startup
-network_state = {
-    "graph": None,
-    "original_edges": None,
-    "pos": pos,
-    "sources": ["Terminal 1", "Terminal 2"],
-    "sinks": [f"Store {i}" for i in range(1, 15)],
-}
+network_state = NetworkState()
 
 
 def initialize_network():
     """Initialize the logistics network from data."""
-    network_state["graph"] = build_graph(edges)
-    network_state["original_edges"] = [(e[0], e[1], e[2]) for e in edges]
+    network_state.graph = build_graph(edges)
+    network_state.original_edges = [(e[0], e[1], e[2]) for e in edges]
+    network_state.cached_state = None
+    network_state.capacity_version += 1
+    network_state.sources_table = _build_index_table(
+        "Sources Index", "Source", network_state.sources
+    )
+    network_state.sinks_table = _build_index_table(
+        "Targets Index", "Target", network_state.sinks
+    )
+    network_state.ac_sorted = sorted(
+        (name.lower(), name) for name in get_edge_autocomplete_list(network_state.graph)
+    )
 
 
-def print_welcome():
-    """Print welcome message with instructions."""
-    welcome_text = """
+def _state():
+    """Return the current network state, recomputing it only after changes."""
+    if network_state.cached_state is None:
+        state = get_current_state(network_state.graph)
+        state["edges"] = tuple(state["edges"])
+        network_state.cached_state = state
+    return network_state.cached_state
+
+
+# Static texts are parsed into Rich renderables once at import. A Panel only
+# parses markup of its str content, console.print() also highlights it
+_WELCOME_PANEL = Panel(
+    Text.from_markup("""
 [bold cyan]Logistics Network Simulator[/bold cyan]
 Interactive console app for managing logistics networks
 
@@ -58,48 +109,30 @@ Interactive console app for managing logistics networks
     [bold]exit[/bold]     - Exit application
 
 Use [cyan]draw --help[/cyan] or [cyan]set --help[/cyan] for more details.
-        """
-    console.print(Panel(welcome_text, border_style="cyan"))
-
+        """),
+    border_style="cyan",
+)
 
-def print_network_info():
-    """Print current network information."""
-    state = get_current_state(network_state["graph"])
 
-    table = Table(title="Network Status", show_header=True, header_style="bold cyan")
-    table.add_column("Metric", style="dim")
-    table.add_column("Value", style="green")
+def print_welcome():
+    """Print welcome message with instructions."""
+    console.print(_WELCOME_PANEL)
 
-    table.add_row("Nodes", str(state["num_nodes"]))
-    table.add_row("Edges", str(state["num_edges"]))
 
-    console.print(table)
+def _build_index_table(title, column, names):
+    """Build a numbered index table, or None when there is nothing to list."""
+    if not names:
+        return None
+    table = Table(title=title, show_header=True, header_style="bold magenta")
+    table.add_column("#", style="bold yellow")
+    table.add_column(column, style="cyan")
+    for idx, name in enumerate(names, start=1):
+        table.add_row(str(idx), name)
+    return table
 
-    # Print index table for Sources
-    sources = network_state.get("sources", [])
-    if sources:
-        sources_table = Table(
-            title="Sources Index", show_header=True, header_style="bold magenta"
-        )
-        sources_table.add_column("#", style="bold yellow")
-        sources_table.add_column("Source", style="cyan")
-        for idx, source in enumerate(sources, start=1):
-            sources_table.add_row(str(idx), source)
-        console.print(sources_table)
-
-    # Print index table for Targets
-    sinks = network_state.get("sinks", [])
-    if sinks:
-        sinks_table = Table(
-            title="Targets Index", show_header=True, header_style="bold magenta"
-        )
-        sinks_table.add_column("#", style="bold yellow")
-        sinks_table.add_column("Target", style="cyan")
-        for idx, sink in enumerate(sinks, start=1):
-            sinks_table.add_row(str(idx), sink)
-        console.print(sinks_table)
 
-    # Print edges table
+def _build_edges_table(edges):
+    """Build the Network Edges table for the given (source, target, capacity) rows."""
     edges_table = Table(
         title="Network Edges", show_header=True, header_style="bold cyan"
     )
@@ -108,42 +141,81 @@ def print_network_info():
     edges_table.add_column("Target", style="cyan")
     edges_table.add_column("Capacity", style="green")
 
-    for idx, (source, target, capacity) in enumerate(state["edges"], start=1):
-        edges_table.add_row(str(idx), source, target, str(capacity))
+    # Rows are formatted up front, then added to the table in one loop
+    rows = [
+        (str(idx), source, target, str(capacity))
+        for idx, (source, target, capacity) in enumerate(edges, start=1)
+    ]
+    for row in rows:
+        edges_table.add_row(*row)
 
-    console.print(edges_table)
+    return edges_table
+
+
+def print_network_info():
+    """Print current network information."""
+    state = _state()
+
+    table = Table(title="Network Status", show_header=True, header_style="bold cyan")
+    table.add_column("Metric", style="dim")
+    table.add_column("Value", style="green")
+
+    table.add_row("Nodes", str(state["num_nodes"]))
+    table.add_row("Edges", str(state["num_edges"]))
+
+    console.print(table)
+
+    # Print index tables for Sources and Targets, they never change
+    if network_state.sources_table is not None:
+        console.print(network_state.sources_table)
+    if network_state.sinks_table is not None:
+        console.print(network_state.sinks_table)
+
+    # Print edges table from the cached edge rows
+    console.print(_build_edges_table(state["edges"]))
 
 
 def edge_autocomplete(incomplete: str) -> list[str]:
     """Autocomplete function for edge names."""
-    if network_state["graph"] is None:
+    if network_state.graph is None:
         return []
 
-    available_edges = get_edge_autocomplete_list(network_state["graph"])
-    return [e for e in available_edges if e.lower().startswith(incomplete.lower())]
+    # Matches of a prefix form a contiguous run in the sorted list
+    ac_sorted = network_state.ac_sorted
+    prefix = incomplete.lower()
+    matches = []
+    i = bisect_left(ac_sorted, (prefix,))
+    while i < len(ac_sorted) and ac_sorted[i][0].startswith(prefix):
+        matches.append(ac_sorted[i][1])
+        i += 1
+    return matches
 
 
-def set_capacity(edge: str, value: int):
-    """Update the capacity of a network edge by edge name (internal use)."""
-    if network_state["graph"] is None:
-        console.print("[red]Error: Network not initialized[/red]")
-        return
-    is_valid, source, target = validate_edge(network_state["graph"], edge)
-    if not is_valid:
-        console.print(f"[red]Invalid edge format: '{edge}'[/red]")
+def set_capacity_by_nodes(source, target, value: int):
+    """
+    Update the capacity of an edge given by its end nodes.
+
+    The set command takes the edge from the cached edge list, so it is known
+    to exist and only the value is checked before the direct update.
+    """
+    if value <= 0:
+        console.print(f"[red]\u2717 Capacity must be positive, got {value}[/red]")
         return
-    result = update_edge_capacity(network_state["graph"], source, target, value)
-    if result["success"]:
-        table = Table(show_header=True, header_style="bold cyan")
-        table.add_column("Property", style="dim")
-        table.add_column("Value", style="green")
-        table.add_row("Edge", f"{source} \u2192 {target}")
-        table.add_row("Old Capacity", str(result["old_capacity"]))
-        table.add_row("New Capacity", str(result["new_capacity"]))
-        console.print(f"[green]\u2713 {result['message']}[/green]")
-        console.print(table)
-    else:
-        console.print(f"[red]\u2717 {result['message']}[/red]")
+
+    old_capacity = set_edge_capacity(network_state.graph, source, target, value)
+    network_state.cached_state = None
+    network_state.capacity_version += 1
+
+    table = Table(show_header=True, header_style="bold cyan")
+    table.add_column("Property", style="dim")
+    table.add_column("Value", style="green")
+    table.add_row("Edge", f"{source} \u2192 {target}")
+    table.add_row("Old Capacity", str(old_capacity))
+    table.add_row("New Capacity", str(value))
+    console.print(
+        f"[green]\u2713 Updated edge {source} -> {target}: {old_capacity} \u2192 {value}[/green]"
+    )
+    console.print(table)
 
 
 @app.command()
@@ -158,30 +230,31 @@ def draw(option: str = typer.Option("basic", help="basic or load visualization")
     if not isinstance(option, str):
         option = "basic"
 
-    if network_state["graph"] is None:
+    if network_state.graph is None:
         console.print("[red]Error: Network not initialized[/red]")
         return
 
-    if option.lower() not in ["basic", "load"]:
+    opt = option.lower()
+    if opt not in _DRAW_OPTS:
         console.print(f"[red]Invalid option '{option}'. Use 'basic' or 'load'[/red]")
         return
 
     try:
         console.print(f"[yellow]Rendering {option} visualization...[/yellow]")
 
-        if option.lower() == "basic":
-            draw_graph(network_state["graph"], network_state["pos"])
+        if opt == "basic":
+            draw_graph(network_state.graph, network_state.pos)
         else:  # load
             # Calculate flow for load visualization
             flow_result = calculate_network_max_flow(
-                network_state["graph"], network_state["sources"], network_state["sinks"]
+                network_state.graph, network_state.sources, network_state.sinks
             )
             draw_network_load_graph(
-                network_state["graph"],
+                network_state.graph,
                 flow_result["flow_dict"],
-                network_state["pos"],
-                network_state["sources"],
-                network_state["sinks"],
+                network_state.pos,
+                network_state.sources,
+                network_state.sinks,
             )
 
         console.print("[green]✓ Visualization complete[/green]")
@@ -189,57 +262,10 @@ def draw(option: str = typer.Option("basic", help="basic or load visualization")
         console.print(f"[red]Error rendering visualization: {e}[/red]")
 
 
-# @app.command()
-# def set_capacity(
-#     edge: str = typer.Argument(..., help="Edge in format 'Source -> Target'"),
-#     value: int = typer.Argument(..., help="New capacity value"),
-# ):
-#     """
-#     Update the capacity of a network edge.
-
-#     Example:
-#       set "Terminal 1 -> Warehouse 1" 50
-#     """
-#     if network_state["graph"] is None:
-#         console.print("[red]Error: Network not initialized[/red]")
-#         return
-
-#     # Validate edge format
-#     is_valid, source, target = validate_edge(network_state["graph"], edge)
-
-#     if not is_valid:
-#         # Try to help user find correct edge format
-#         available = get_edge_autocomplete_list(network_state["graph"])
-#         console.print(f"[red]Invalid edge format: '{edge}'[/red]")
-#         console.print("[cyan]Available edges sample:[/cyan]")
-#         for i, e in enumerate(available[:5]):
-#             console.print(f"  {e}")
-#         if len(available) > 5:
-#             console.print(f"  ... and {len(available) - 5} more")
-#         return
-
-#     # Update capacity
-#     result = update_edge_capacity(network_state["graph"], source, target, value)
-
-#     if result["success"]:
-#         console.print(f"[green]✓ {result['message']}[/green]")
-
-#         # Show updated edge info
-#         table = Table(show_header=True, header_style="bold cyan")
-#         table.add_column("Property", style="dim")
-#         table.add_column("Value", style="green")
-#         table.add_row("Edge", f"{source} → {target}")
-#         table.add_row("Old Capacity", str(result["old_capacity"]))
-#         table.add_row("New Capacity", str(result["new_capacity"]))
-#         console.print(table)
-#     else:
-#         console.print(f"[red]✗ {result['message']}[/red]")
-
-
 @app.command()
 def status():
     """Display current network status and edge capacities."""
-    if network_state["graph"] is None:
+    if network_state.graph is None:
         console.print("[red]Error: Network not initialized[/red]")
         return
 
@@ -249,7 +275,7 @@ def status():
 @app.command()
 def reset():
     """Reset all edge capacities to original values."""
-    if network_state["graph"] is None:
+    if network_state.graph is None:
         console.print("[red]Error: Network not initialized[/red]")
         return
 
@@ -259,10 +285,7 @@ def reset():
     print_network_info()
 
 
-@app.command()
-def help_cmd():
-    """Display help information."""
-    console.print("""
+_HELP_TEXT = console.render_str("""
 [bold cyan]Logistics Network Simulator - Help[/bold cyan]
 
 [bold]Commands:[/bold]
@@ -312,6 +335,200 @@ def help_cmd():
         """)
 
 
+@app.command()
+def help_cmd():
+    """Display help information."""
+    console.print(_HELP_TEXT)
+
+
+def _resolve_pair(source_idx, sink_idx):
+    """
+    Map 1-based source/sink indices to node names.
+
+    Returns None when an index is out of range, or when source and sink are
+    the same node and the max flow is trivially 0, so there is nothing to run.
+    """
+    sources = network_state.sources
+    sinks = network_state.sinks
+    if not (1 <= source_idx <= len(sources)):
+        console.print(
+            f"[red]Source index {source_idx} out of range (1-{len(sources)})[/red]"
+        )
+        return None
+    if not (1 <= sink_idx <= len(sinks)):
+        console.print(f"[red]Sink index {sink_idx} out of range (1-{len(sinks)})[/red]")
+        return None
+    source, sink = sources[source_idx - 1], sinks[sink_idx - 1]
+    if source == sink:
+        console.print(f"[green]Max Flow from '{source}' to itself: 0[/green]")
+        return None
+    return source, sink
+
+
+def _cached_flow(source, sink, solver, compute):
+    """
+    Return the result of compute() for this pair and solver, memoized.
+
+    Keys include the capacity version, so entries from before a capacity
+    change are never hit again and simply age out of the LRU.
+    """
+    key = (source, sink, solver, network_state.capacity_version)
+    cache = network_state.flow_cache
+    if key in cache:
+        cache.move_to_end(key)
+        return cache[key]
+
+    result = compute()
+    cache[key] = result
+    if len(cache) > FLOW_CACHE_SIZE:
+        cache.popitem(last=False)
+    return result
+
+
+def _network_flow(source, sink):
+    """Max flow of a single pair through the unified network, memoized."""
+    return _cached_flow(
+        source,
+        sink,
+        "network",
+        lambda: calculate_network_max_flow(
+            network_state.graph, [source], [sink], explain=True
+        ),
+    )
+
+
+def _network_flow_value(source, sink):
+    """Max flow value of a single pair through the unified network, memoized."""
+    return _cached_flow(
+        source,
+        sink,
+        "network_value",
+        lambda: calculate_network_max_flow_value(network_state.graph, [source], [sink]),
+    )
+
+
+def _edmonds_karp_flow(source, sink):
+    """Max flow value of a pair with the CSR Edmonds-Karp solver, memoized."""
+    return _cached_flow(
+        source,
+        sink,
+        "edmonds_karp",
+        lambda: csr_maximum_flow_value(
+            network_state.graph, source, sink, "edmonds_karp"
+        ),
+    )
+
+
+def _do_status(args):
+    """Handle `status`."""
+    print_network_info()
+
+
+def _do_draw(args):
+    """Handle `draw [basic|load]`."""
+    if not args:
+        draw()
+    elif len(args) == 1 and args[0] in _DRAW_OPTS:
+        draw(args[0])
+    else:
+        console.print(
+            "[red]Invalid draw command. Use 'draw basic' or 'draw load'[/red]"
+        )
+
+
+def _do_set(args):
+    """Handle `set INDEX VALUE`."""
+    if len(args) != 2:
+        console.print("[red]Error: set command requires INDEX and VALUE[/red]")
+        console.print("Usage: set INDEX VALUE")
+        return
+    try:
+        idx = int(args[0])
+        value = int(args[1])
+    except ValueError:
+        console.print("[red]Error: Both INDEX and VALUE must be integers[/red]")
+        return
+    edges = _state()["edges"]
+    if 1 <= idx <= len(edges):
+        source, target, _ = edges[idx - 1]
+        set_capacity_by_nodes(source, target, value)
+    else:
+        console.print(f"[red]Error: Index {idx} is out of range (1-{len(edges)})[/red]")
+
+
+def _do_reset(args):
+    """Handle `reset`."""
+    reset()
+
+
+def _do_help(args):
+    """Handle `help` and `?`."""
+    help_cmd()
+
+
+def _do_maxflow_analysis(args):
+    """Handle `maxflow-analisis SOURCE_INDEX SINK_INDEX`."""
+    if len(args) < 2:
+        console.print(
+            "[red]Usage: maxflow-analisis SOURCE_INDEX SINK_INDEX\nExample: maxflow-analisis 1 3[/red]"
+        )
+        return
+    try:
+        pair = _resolve_pair(int(args[0]), int(args[1]))
+        if pair is None:
+            return
+        source, sink = pair
+        result = _network_flow(source, sink)
+        max_flow = result["max_flow"]
+        console.print(
+            f"[green]Max Flow Analysis from '{source}' to '{sink}': {max_flow}[/green]"
+        )
+        console.print(result["optimality_analysis"]["explanation"])
+    except Exception as e:
+        console.print(f"[red]Error running maxflow-analisis: {e}[/red]")
+
+
+def _do_maxflow(args):
+    """Handle `maxflow SOURCE_INDEX SINK_INDEX [FUNCTION]`."""
+    if len(args) < 2:
+        console.print(
+            "[red]Usage: maxflow SOURCE_INDEX SINK_INDEX [FUNCTION]\nExample: maxflow 1 3 networkx[/red]"
+        )
+        return
+    try:
+        pair = _resolve_pair(int(args[0]), int(args[1]))
+        if pair is None:
+            return
+        source, sink = pair
+        func = args[2] if len(args) > 2 else "networkx"
+        if func == "custom":
+            max_flow = _network_flow_value(source, sink)
+            console.print(
+                f"[green]Custom Max Flow from '{source}' to '{sink}': {max_flow}[/green]"
+            )
+        else:
+            max_flow = _edmonds_karp_flow(source, sink)
+            console.print(
+                f"[green]Edmonds-Karp Max Flow from '{source}' to '{sink}': {max_flow}[/green]"
+            )
+    except Exception as e:
+        console.print(f"[red]Error running maxflow: {e}[/red]")
+
+
+# REPL command handlers keyed by the first word of the input, each one gets
+# the remaining words
+COMMANDS = {
+    "status": _do_status,
+    "draw": _do_draw,
+    "set": _do_set,
+    "reset": _do_reset,
+    "help": _do_help,
+    "?": _do_help,
+    "maxflow-analisis": _do_maxflow_analysis,
+    "maxflow": _do_maxflow,
+}
+
+
 @app.command()
 def main():
     """Main interactive loop for the console application."""
@@ -321,147 +538,26 @@ def main():
     # Print welcome message
     print_welcome()
     console.print(
-        f"[green]✓ Network loaded with {len(network_state['graph'].nodes())} nodes and {len(network_state['graph'].edges())} edges[/green]\n"
+        f"[green]✓ Network loaded with {network_state.graph.number_of_nodes()} nodes and {network_state.graph.number_of_edges()} edges[/green]\n"
     )
 
     # Interactive loop
     while True:
         try:
             user_input = Prompt.ask("[bold cyan]network>>[/bold cyan]")
-            if not user_input.strip():
+            # Normalize once: split() also drops surrounding whitespace
+            parts = user_input.lower().split()
+            if not parts:
                 continue
-            command = user_input.strip().lower()
-            if command == "exit":
+            cmd = parts[0]
+            if cmd == "exit":
                 console.print("[yellow]Exiting Logistics Network Simulator...[/yellow]")
                 break
-            elif command == "status":
-                print_network_info()
-            elif command.startswith("draw"):
-                parts = command.split()
-                if len(parts) == 1:
-                    draw()
-                elif len(parts) == 2 and parts[1] in ["basic", "load"]:
-                    draw(parts[1])
-                else:
-                    console.print(
-                        "[red]Invalid draw command. Use 'draw basic' or 'draw load'[/red]"
-                    )
-            elif command.startswith("set "):
-                parts = command[4:].strip().split()
-                if len(parts) == 2:
-                    idx_str, value_str = parts
-                    try:
-                        idx = int(idx_str)
-                        value = int(value_str)
-                        state = get_current_state(network_state["graph"])
-                        edges = state["edges"]
-                        if 1 <= idx <= len(edges):
-                            source, target, _ = edges[idx - 1]
-                            set_capacity(f"{source} -> {target}", value)
-                        else:
-                            console.print(
-                                f"[red]Error: Index {idx} is out of range (1-{len(edges)})[/red]"
-                            )
-                    except ValueError:
-                        console.print(
-                            "[red]Error: Both INDEX and VALUE must be integers[/red]"
-                        )
-                else:
-                    console.print(
-                        "[red]Error: set command requires INDEX and VALUE[/red]"
-                    )
-                    console.print("Usage: set INDEX VALUE")
-            elif command == "reset":
-                reset()
-            elif command in ["help", "?"]:
-                help_cmd()
-            elif command.startswith("maxflow-analisis"):
-                parts = command.split()
-                if len(parts) < 3:
-                    console.print(
-                        "[red]Usage: maxflow-analisis SOURCE_INDEX SINK_INDEX\nExample: maxflow-analisis 1 3[/red]"
-                    )
-                    continue
-                try:
-                    source_idx = int(parts[1])
-                    sink_idx = int(parts[2])
-                    sources = network_state.get("sources", [])
-                    sinks = network_state.get("sinks", [])
-                    if not (1 <= source_idx <= len(sources)):
-                        console.print(
-                            f"[red]Source index {source_idx} out of range (1-{len(sources)})[/red]"
-                        )
-                        continue
-                    if not (1 <= sink_idx <= len(sinks)):
-                        console.print(
-                            f"[red]Sink index {sink_idx} out of range (1-{len(sinks)})[/red]"
-                        )
-                        continue
-                    source = sources[source_idx - 1]
-                    sink = sinks[sink_idx - 1]
-                    G = network_state["graph"]
-                    from .utils import calculate_network_max_flow
-
-                    result = calculate_network_max_flow(G, [source], [sink])
-                    max_flow = result["max_flow"]
-                    console.print(
-                        f"[green]Max Flow Analysis from '{source}' to '{sink}': {max_flow}[/green]"
-                    )
-                    console.print(result["optimality_analysis"]["explanation"])
-                except Exception as e:
-                    console.print(f"[red]Error running maxflow-analisis: {e}[/red]")
-            elif command.startswith("maxflow"):
-                parts = command.split()
-                if len(parts) < 3:
-                    console.print(
-                        "[red]Usage: maxflow SOURCE_INDEX SINK_INDEX [FUNCTION]\nExample: maxflow 1 3 networkx[/red]"
-                    )
-                    continue
-                try:
-                    source_idx = int(parts[1])
-                    sink_idx = int(parts[2])
-                    func = parts[3] if len(parts) > 3 else "networkx"
-                    sources = network_state.get("sources", [])
-                    sinks = network_state.get("sinks", [])
-                    if not (1 <= source_idx <= len(sources)):
-                        console.print(
-                            f"[red]Source index {source_idx} out of range (1-{len(sources)})[/red]"
-                        )
-                        continue
-                    if not (1 <= sink_idx <= len(sinks)):
-                        console.print(
-                            f"[red]Sink index {sink_idx} out of range (1-{len(sinks)})[/red]"
-                        )
-                        continue
-                    source = sources[source_idx - 1]
-                    sink = sinks[sink_idx - 1]
-                    G = network_state["graph"]
-                    if func == "custom":
-                        from .utils import calculate_network_max_flow
-
-                        result = calculate_network_max_flow(G, [source], [sink])
-                        max_flow = result["max_flow"]
-                        console.print(
-                            f"[green]Custom Max Flow from '{source}' to '{sink}': {max_flow}[/green]"
-                        )
-                    else:
-                        from edmonds_karp import (
-                            edmonds_karp,
-                        )
-                        from .utils import prepare_capacity_matrix
-
-                        capacity_matrix = prepare_capacity_matrix(G)
-                        node_list = list(G.nodes())
-                        source_idx = node_list.index(source)
-                        sink_idx = node_list.index(sink)
-                        result = edmonds_karp(capacity_matrix, source_idx, sink_idx)
-                        console.print(
-                            f"[green]Edmonds-Karp Max Flow from '{source}' to '{sink}': {result['max_flow']}[/green]"
-                        )
-                except Exception as e:
-                    console.print(f"[red]Error running maxflow: {e}[/red]")
+            handler = COMMANDS.get(cmd)
+            if handler is not None:
+                handler(parts[1:])
             else:
-                console.print(f"[yellow]Unknown command: '{command}'[/yellow]")
+                console.print(f"[yellow]Unknown command: '{' '.join(parts)}'[/yellow]")
                 console.print("[cyan]Type 'help' for available commands[/cyan]")
         except KeyboardInterrupt:
             console.print("\n[yellow]Interrupted. Type 'exit' to quit.[/yellow]")
@@ -0,0 +1,167 @@
+import numpy as np
+
+try:
+    from .jit import njit
+except ImportError:
+    from jit import njit
+
+
+@njit(cache=True)
+def global_relabel(indptr, indices, cap, rev, flow, source, sink, height, count, queue):
+    """
+    Recomputes exact heights with reverse Breadth-First Searches.
+
+    Nodes that can reach the sink in the residual graph get their distance to
+    the sink, nodes that can only return flow get V plus their distance to the
+    source, all other nodes get 2V and never become active.
+    Also rebuilds count[h], the number of nodes at height h.
+    """
+    num_nodes = indptr.shape[0] - 1
+    height[:] = 2 * num_nodes
+    height[sink] = 0
+    height[source] = num_nodes
+
+    for root in (sink, source):
+        queue[0] = root
+        head, tail = 0, 1
+
+        while head < tail:
+            current_node = queue[head]
+            head += 1
+
+            # Arc t = rev[k] goes from neighbor to current_node
+            for k in range(indptr[current_node], indptr[current_node + 1]):
+                neighbor = indices[k]
+                t = rev[k]
+                if height[neighbor] == 2 * num_nodes and cap[t] - flow[t] > 0:
+                    height[neighbor] = height[current_node] + 1
+                    queue[tail] = neighbor
+                    tail += 1
+
+    count[:] = 0
+    for node in range(num_nodes):
+        count[height[node]] += 1
+
+
+@njit(cache=True)
+def _push_relabel(indptr, indices, cap, rev, flow, source, sink):
+    """
+    Runs FIFO push-relabel in place and returns the flow value.
+    """
+    num_nodes = indptr.shape[0] - 1
+    height = np.zeros(num_nodes, dtype=np.int32)
+    count = np.zeros(2 * num_nodes + 1, dtype=np.int32)
+    excess = np.zeros(num_nodes, dtype=cap.dtype)
+    iter_ptr = indptr[:-1].copy()
+    active = np.zeros(num_nodes, dtype=np.uint8)
+    # FIFO of active nodes as a ring buffer, a node is queued at most once
+    fifo = np.empty(num_nodes, dtype=np.int32)
+    queue = np.empty(num_nodes, dtype=np.int32)
+
+    if source == sink:
+        return 0
+
+    # Saturate every arc leaving the source
+    for k in range(indptr[source], indptr[source + 1]):
+        residual = cap[k] - flow[k]
+        if residual > 0:
+            flow[k] += residual
+            flow[rev[k]] -= residual
+            excess[indices[k]] += residual
+            excess[source] -= residual
+
+    global_relabel(indptr, indices, cap, rev, flow, source, sink, height, count, queue)
+
+    head, size = 0, 0
+    for node in range(num_nodes):
+        if node != source and node != sink and excess[node] > 0:
+            fifo[(head + size) % num_nodes] = node
+            size += 1
+            active[node] = 1
+
+    relabels = 0
+    while size > 0:
+        current_node = fifo[head]
+        head = (head + 1) % num_nodes
+        size -= 1
+        active[current_node] = 0
+
+        # Discharge the node
+        while excess[current_node] > 0:
+            if iter_ptr[current_node] == indptr[current_node + 1]:
+                # Relabel: no admissible arc is left
+                old_height = height[current_node]
+                new_height = 2 * num_nodes
+                for k in range(indptr[current_node], indptr[current_node + 1]):
+                    if cap[k] - flow[k] > 0:
+                        new_height = min(new_height, height[indices[k]] + 1)
+                count[old_height] -= 1
+                height[current_node] = new_height
+                count[new_height] += 1
+                iter_ptr[current_node] = indptr[current_node]
+                relabels += 1
+
+                # Gap: nodes above an empty height below V cannot reach the sink
+                if count[old_height] == 0 and old_height < num_nodes:
+                    for node in range(num_nodes):
+                        if old_height < height[node] < num_nodes:
+                            count[height[node]] -= 1
+                            height[node] = num_nodes + 1
+                            count[num_nodes + 1] += 1
+
+                if relabels >= num_nodes:
+                    global_relabel(
+                        indptr,
+                        indices,
+                        cap,
+                        rev,
+                        flow,
+                        source,
+                        sink,
+                        height,
+                        count,
+                        queue,
+                    )
+                    iter_ptr[:] = indptr[:-1]
+                    relabels = 0
+                continue
+
+            k = iter_ptr[current_node]
+            neighbor = indices[k]
+            residual = cap[k] - flow[k]
+            if residual > 0 and height[current_node] == height[neighbor] + 1:
+                # Push
+                delta = min(excess[current_node], residual)
+                flow[k] += delta
+                flow[rev[k]] -= delta
+                excess[current_node] -= delta
+                excess[neighbor] += delta
+                if neighbor != source and neighbor != sink and not active[neighbor]:
+                    fifo[(head + size) % num_nodes] = neighbor
+                    size += 1
+                    active[neighbor] = 1
+            else:
+                iter_ptr[current_node] += 1
+
+    return excess[sink]
+
+
+def push_relabel(indptr, indices, cap, rev, source, sink):
+    """
+    Implements the FIFO push-relabel algorithm with the gap and global relabel
+    heuristics to find the maximum flow from source to sink.
+
+    Args:
+        indptr: CSR row pointers of the residual graph.
+        indices: Head node of each arc.
+        cap: Capacity of each arc.
+        rev: Index of the twin (reverse) arc of each arc.
+        source: Index of the source node.
+        sink: Index of the sink node.
+    Returns:
+        dict: The value of the maximum flow and the flow of each arc.
+    """
+    flow = np.zeros_like(cap)
+    max_flow = _push_relabel(indptr, indices, cap, rev, flow, source, sink)
+
+    return {"max_flow": int(max_flow), "flow": flow}
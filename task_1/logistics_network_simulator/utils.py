@@ -1,39 +1,406 @@
+import weakref
+from collections import OrderedDict, deque
+
 import networkx as nx
+import numpy as np
+
+try:
+    from .dinic import dinic
+    from .edmonds_karp import edmonds_karp
+    from .incremental_flow import augment_to_max, shrink_edge_flow
+    from .push_relabel import push_relabel
+except ImportError:
+    from dinic import dinic
+    from edmonds_karp import edmonds_karp
+    from incremental_flow import augment_to_max, shrink_edge_flow
+    from push_relabel import push_relabel
+
+# Max-flow solvers working on the CSR residual graph, selectable by name
+CSR_FLOW_FUNCS = {
+    "dinic": dinic,
+    "edmonds_karp": edmonds_karp,
+    "push_relabel": push_relabel,
+}
+
+# Above this edges-per-node ratio "auto" picks push-relabel over Dinic
+DENSE_GRAPH_RATIO = 4
+
+# Max number of unified networks with their flows cached per graph
+UNIFIED_CACHE_SIZE = 8
+
+# Data derived from each graph (node index, capacity totals, CSR arrays,
+# unified networks). Kept outside G.graph so the graph stays serializable
+# and copies of it never share entries, dropped with the graph itself
+_GRAPH_CACHES = weakref.WeakKeyDictionary()
+
+# Report templates of check_optimal_flow(), filled with str.format() from the
+# analysis dict plus the source and sink names
+_REPORT_HEADER = (
+    "\n" + "=" * 70 + "\n"
+    "OPTIMAL FLOW ANALYSIS\n" + "=" * 70 + "\n"
+    "Maximum Flow: {max_flow} units\n"
+    "Minimum Cut Value: {min_cut_value} units\n"
+    "Total Capacity from {source}: {source_capacity} units\n"
+    "Total Capacity to {sink}: {sink_capacity} units\n" + "-" * 70 + "\n"
+)
+_REPORT_FOOTER = "=" * 70 + "\n"
+_OPTIMAL_TEMPLATE = (
+    _REPORT_HEADER + "✓ OPTIMAL FLOW ACHIEVED!\n"
+    "The flow is optimal because the value of the maximum flow equals the capacity of the minimum cut.\n"
+    "No augmenting path exists from {source} to {sink} in the residual graph, therefore the flow cannot be increased.\n"
+    "\nBy the Max-Flow Min-Cut Theorem:\n"
+    "  - The maximum flow ({max_flow}) equals the minimum cut ({min_cut_value})\n"
+    "  - This means no augmenting path exists in the residual graph\n"
+    "  - The flow cannot be increased further\n\n"
+    "{source_note}{sink_note}"
+    "\n  The network bottleneck is {bottleneck} units.\n" + _REPORT_FOOTER
+)
+_NONOPTIMAL_TEMPLATE = (
+    _REPORT_HEADER + "✗ OPTIMAL FLOW NOT ACHIEVED\n"
+    "  - There is a discrepancy between max flow and min cut\n"
+    "  - This may indicate an error in the calculation\n" + _REPORT_FOOTER
+)
+_SOURCE_SATURATED_NOTE = (
+    "  - The source '{source}' is fully saturated\n"
+    "    (all {source_capacity} units of outgoing capacity are used)\n"
+)
+_SINK_SATURATED_NOTE = (
+    "  - The sink '{sink}' is fully saturated\n"
+    "    (all {sink_capacity} units of incoming capacity are used)\n"
+)
+
+
+def _graph_cache(G):
+    """Returns the dict of cached data derived from G."""
+    cache = _GRAPH_CACHES.get(G)
+    if cache is None:
+        cache = _GRAPH_CACHES[G] = {}
+    return cache
+
+
+def _edge_state(G):
+    """
+    Returns a snapshot of the nodes, edges and capacities of G.
+
+    Caches keep it next to their data and compare it with a fresh one, so
+    any change to G is noticed, also a direct G[u][v]["capacity"] write or
+    an edge swapped for another one.
+    """
+    return tuple(G), tuple(G.edges(data="capacity", default=0))
+
+
+def _get_node_index(G):
+    """
+    Returns the node order shared by the matrix, CSR and capacity helpers.
+
+    Cached with the node sequence it was built from and rebuilt as soon as
+    that differs, so a node swapped for another one is never missed.
+
+    Returns:
+        tuple: (node_list, node_index) where node_list follows G.nodes()
+            and node_index[node] is the position of node in it
+    """
+    cache = _graph_cache(G)
+    nodes = tuple(G)
+    cached = cache.get("node_index")
+    if cached is None or cached[0] != nodes:
+        node_list = list(nodes)
+        node_index = {node: i for i, node in enumerate(node_list)}
+        cached = cache["node_index"] = (nodes, (node_list, node_index))
+    return cached[1]
+
+
+def prepare_capacity_csr(G):
+    """
+    Prepares the residual graph in CSR (compressed sparse row) form.
+
+    Every directed edge u -> v becomes a forward arc with the edge capacity
+    and a reverse residual arc v -> u with zero capacity. Within each row the
+    forward arcs come before the reverse ones. Node indices follow the order
+    of G.nodes().
+
+    Args:
+        G: NetworkX DiGraph
+
+    Returns:
+        tuple: (indptr, indices, cap, rev) where the arcs of node u are
+            indptr[u]:indptr[u + 1], indices[k] is the head of arc k,
+            cap[k] its capacity and rev[k] the index of its twin arc.
+    """
+    return _csr_cache(G)[2]
+
+
+def _capacity_values(capacities):
+    """Returns capacities as int64 if all are whole numbers, else float64."""
+    values = np.asarray(capacities, dtype=np.float64)
+    if np.all(np.mod(values, 1) == 0):
+        return values.astype(np.int64)
+    return values
+
 
+def _build_csr_arcs(num_nodes, tails, heads):
+    """
+    Builds the arc layout of the CSR residual graph of prepare_capacity_csr().
+
+    Args:
+        num_nodes: Number of nodes
+        tails: Index of the tail node of every edge
+        heads: Index of the head node of every edge
+
+    Returns:
+        tuple: (indptr, indices, rev, arcs) where arcs[e] is the forward arc
+            of the edge tails[e] -> heads[e]
+    """
+    # Reverse arcs follow the forward ones with swapped ends
+    num_edges = len(tails)
+    arc_tails = np.concatenate((tails, heads))
+    arc_heads = np.concatenate((heads, tails))
+
+    # Stable sort by tail keeps forward arcs ahead of reverse arcs in a row
+    order = np.argsort(arc_tails, kind="stable")
+    position = np.empty_like(order)
+    position[order] = np.arange(order.size)
+
+    indptr = np.zeros(num_nodes + 1, dtype=np.int32)
+    np.cumsum(np.bincount(arc_tails, minlength=num_nodes), out=indptr[1:])
+    indices = arc_heads[order].astype(np.int32)
+    twin = (order + num_edges) % max(2 * num_edges, 1)
+    rev = position[twin].astype(np.int32)
+    return indptr, indices, rev, position[:num_edges]
+
+
+def _csr_cache(G):
+    """
+    Returns the CSR residual graph of G with its node lookup tables.
+
+    The arc layout is cached with the nodes and edges it was built from and
+    reused while they stay the same. Capacities are read from G on every
+    call into a new cap array, so edits of any kind are always seen.
 
-def prepare_capacity_matrix(G):
+    Returns:
+        tuple: (node_list, node_index, csr) where csr is the tuple of
+            prepare_capacity_csr()
+    """
+    edge_list = tuple(G.edges(data="capacity", default=0))
+    tails, heads, capacities = zip(*edge_list) if edge_list else ((), (), ())
+    layout_key = (tuple(G), tails, heads)
+
+    cache = _graph_cache(G)
+    cached = cache.get("csr")
+    if cached is None or cached[0] != layout_key:
+        node_list, node_index = _get_node_index(G)
+        arcs = _build_csr_arcs(
+            len(node_list),
+            np.fromiter(map(node_index.get, tails), dtype=np.int64, count=len(tails)),
+            np.fromiter(map(node_index.get, heads), dtype=np.int64, count=len(heads)),
+        )
+        cached = cache["csr"] = (layout_key, (node_list, node_index, arcs))
+    node_list, node_index, (indptr, indices, rev, arcs) = cached[1]
+
+    values = _capacity_values(capacities)
+    cap = np.zeros(indices.size, dtype=values.dtype)
+    cap[arcs] = values
+    return node_list, node_index, (indptr, indices, cap, rev)
+
+
+def _csr_solve(G, source, sink, flow_func):
     """
-    Prepares the capacity matrix from the graph.
+    Runs a CSR max-flow solver on the graph.
+
+    Args:
+        G: NetworkX DiGraph
+        source: Source node name
+        sink: Sink node name
+        flow_func: Name of the solver in CSR_FLOW_FUNCS, or "auto" to pick
+            push-relabel for dense graphs and Dinic otherwise
+
+    Returns:
+        tuple: (result, node_list, csr) with the dict returned by the
+            solver, or None if a capacity is fractional
+    """
+    if flow_func == "auto":
+        density = G.number_of_edges() / max(G.number_of_nodes(), 1)
+        flow_func = "push_relabel" if density > DENSE_GRAPH_RATIO else "dinic"
+
+    node_list, node_index, csr = _csr_cache(G)
+    if csr[2].dtype.kind == "f":
+        # The CSR solvers count on integer capacities to terminate exactly
+        return None
+
+    result = CSR_FLOW_FUNCS[flow_func](*csr, node_index[source], node_index[sink])
+    return result, node_list, csr
+
+
+def csr_maximum_flow(G, source, sink, flow_func):
+    """
+    Runs a CSR max-flow solver on the graph and maps the result back to nodes.
+
+    Args:
+        G: NetworkX DiGraph
+        source: Source node name
+        sink: Sink node name
+        flow_func: Name of the solver in CSR_FLOW_FUNCS, or "auto" to pick
+            push-relabel for dense graphs and Dinic otherwise; ignored when
+            a capacity is fractional, NetworkX preflow_push is used then
+
+    Returns:
+        tuple: (max_flow, flow_dict) in the same shape as nx.maximum_flow
+    """
+    solved = _csr_solve(G, source, sink, flow_func)
+    if solved is None:
+        return nx.maximum_flow(
+            G, source, sink, flow_func=nx.algorithms.flow.preflow_push
+        )
+    result, node_list, (indptr, indices, _, _) = solved
+
+    # Only forward arcs can carry positive flow, their twins hold its negation
+    flow = result["flow"]
+    tails = np.repeat(np.arange(len(node_list)), np.diff(indptr))
+    flow_dict = {u: dict.fromkeys(G[u], 0) for u in G}
+    for k in np.flatnonzero(flow > 0):
+        flow_dict[node_list[tails[k]]][node_list[indices[k]]] = int(flow[k])
+
+    return result["max_flow"], flow_dict
+
+
+def csr_maximum_flow_value(G, source, sink, flow_func):
+    """
+    Runs a CSR max-flow solver on the graph and returns only the flow value.
+
+    Unlike csr_maximum_flow() the arc flows are not mapped back to a flow
+    dictionary over the nodes.
+
+    Args:
+        G: NetworkX DiGraph
+        source: Source node name
+        sink: Sink node name
+        flow_func: Same as for csr_maximum_flow()
+
+    Returns:
+        The maximum flow value
+    """
+    solved = _csr_solve(G, source, sink, flow_func)
+    if solved is None:
+        return nx.maximum_flow_value(
+            G, source, sink, flow_func=nx.algorithms.flow.preflow_push
+        )
+    return solved[0]["max_flow"]
+
+
+def _capacity_in_out(G, arrays=False):
+    """
+    Returns the total outgoing and incoming capacity of every node.
+
+    All edges are summed in one np.add.at pass. The result is cached and
+    reused while the nodes, edges and capacities stay the same.
+
+    Args:
+        G: NetworkX DiGraph
+        arrays: Return the totals as numpy arrays for vectorized sums
+            instead of lists
+
+    Returns:
+        tuple: (node_index, out_capacity, in_capacity), the two totals are
+            indexed by node_index[node]
+    """
+    cache = _graph_cache(G)
+    state = _edge_state(G)
+    cached = cache.get("capacity_totals")
+    if cached is not None and cached[0] == state:
+        return cached[2] if arrays else cached[1]
+
+    _, node_index = _get_node_index(G)
+    edge_list = state[1]
+    u_idx = np.empty(len(edge_list), dtype=np.int64)
+    v_idx = np.empty(len(edge_list), dtype=np.int64)
+    caps = []
+    for k, (u, v, capacity) in enumerate(edge_list):
+        u_idx[k] = node_index[u]
+        v_idx[k] = node_index[v]
+        caps.append(capacity)
+    caps = np.asarray(caps)
+
+    out_capacity = np.zeros(len(node_index), dtype=caps.dtype)
+    in_capacity = np.zeros(len(node_index), dtype=caps.dtype)
+    np.add.at(out_capacity, u_idx, caps)
+    np.add.at(in_capacity, v_idx, caps)
+
+    # Plain lists so lookups hand back Python numbers
+    result = (node_index, out_capacity.tolist(), in_capacity.tolist())
+    array_result = (node_index, out_capacity, in_capacity)
+    cache["capacity_totals"] = (state, result, array_result)
+    return array_result if arrays else result
+
+
+def residual_min_cut(G, source, flow_dict):
+    """
+    Finds the cut induced by a flow with one BFS over its residual graph.
+
+    The source side holds the nodes reachable from the source through edges
+    with spare capacity or through edges carrying flow backwards. For a
+    maximum flow this is a minimum cut, no second max-flow run is needed.
+
+    Args:
+        G: NetworkX DiGraph
+        source: Source node name
+        flow_dict: Flow of every edge, as returned by nx.maximum_flow
+
+    Returns:
+        tuple: (cut_value, (reachable, non_reachable))
     """
-    capacity_matrix = nx.to_numpy_array(G, weight="capacity")
-    return capacity_matrix
+    reachable = {source}
+    queue = deque([source])
+    while queue:
+        u = queue.popleft()
+        for v, attrs in G.succ[u].items():
+            if v not in reachable and attrs["capacity"] - flow_dict[u][v] > 0:
+                reachable.add(v)
+                queue.append(v)
+        for w in G.pred[u]:
+            if w not in reachable and flow_dict[w][u] > 0:
+                reachable.add(w)
+                queue.append(w)
+
+    cut_value = sum(
+        attrs["capacity"]
+        for u in reachable
+        for v, attrs in G.succ[u].items()
+        if v not in reachable
+    )
+    return cut_value, (reachable, set(G) - reachable)
 
 
-def check_optimal_flow(G, source, sink, max_flow):
+def check_optimal_flow(G, source, sink, max_flow, flow_dict=None, explain=False):
     """
-    Checks if the optimal flow has been achieved and explains why.
+    Checks if the optimal flow has been achieved and optionally explains why.
 
     Args:
         G: NetworkX DiGraph
         source: Source node name
         sink: Sink node name
         max_flow: The calculated maximum flow value
+        flow_dict: Flow of every edge if already known, the minimum cut is
+            then read from its residual graph instead of running
+            nx.minimum_cut (another full max-flow)
+        explain: Also build the printable report under "explanation"
 
     Returns:
-        dict: Analysis results including whether flow is optimal and explanation
+        dict: Analysis results including whether flow is optimal, and the
+            explanation if requested
     """
+    node_index, out_capacity, in_capacity = _capacity_in_out(G)
+
     # Calculate total capacity from source
-    source_capacity = sum(
-        G[source][neighbor]["capacity"] for neighbor in G.successors(source)
-    )
+    source_capacity = out_capacity[node_index[source]]
 
     # Calculate total capacity to sink
-    sink_capacity = sum(
-        G[predecessor][sink]["capacity"] for predecessor in G.predecessors(sink)
-    )
+    sink_capacity = in_capacity[node_index[sink]]
 
-    # Find the minimum cut using NetworkX
-    cut_value, partition = nx.minimum_cut(G, source, sink, capacity="capacity")
+    # Find the minimum cut
+    if flow_dict is not None:
+        cut_value, partition = residual_min_cut(G, source, flow_dict)
+    else:
+        cut_value, partition = nx.minimum_cut(G, source, sink, capacity="capacity")
 
     # Check if flow saturates source or sink
     source_saturated = max_flow >= source_capacity
@@ -57,66 +424,32 @@ def check_optimal_flow(G, source, sink, max_flow):
         "bottleneck": min(source_capacity, sink_capacity, cut_value),
     }
 
-    # Generate explanation
-    explanation = []
-    explanation.append(f"\n{'=' * 70}")
-    explanation.append("OPTIMAL FLOW ANALYSIS")
-    explanation.append(f"{'=' * 70}")
-    explanation.append(f"Maximum Flow: {max_flow} units")
-    explanation.append(f"Minimum Cut Value: {cut_value} units")
-    explanation.append(f"Total Capacity from {source}: {source_capacity} units")
-    explanation.append(f"Total Capacity to {sink}: {sink_capacity} units")
-    explanation.append(f"{'-' * 70}")
+    if not explain:
+        return analysis
 
+    # Fill in the report templates instead of joining it line by line
     if is_optimal:
-        """
-        The flow is optimal because the value of the maximum flow equals the capacity of the minimum cut.
-        No augmenting path exists from SUPER_SOURCE to SUPER_SINK in the residual graph, therefore the flow cannot be increased.
-        """
-        explanation.append("✓ OPTIMAL FLOW ACHIEVED!")
-        explanation.append(
-            f"The flow is optimal because the value of the maximum flow equals the capacity of the minimum cut."
-        )
-        explanation.append(
-            f"No augmenting path exists from {source} to {sink} in the residual graph, therefore the flow cannot be increased."
-        )
-        explanation.append(f"\nBy the Max-Flow Min-Cut Theorem:")
-        explanation.append(
-            f"  - The maximum flow ({max_flow}) equals the minimum cut ({cut_value})"
-        )
-        explanation.append(
-            f"  - This means no augmenting path exists in the residual graph"
-        )
-        explanation.append(f"  - The flow cannot be increased further\n")
-
+        source_note = sink_note = ""
         if source_saturated:
-            explanation.append(f"  - The source '{source}' is fully saturated")
-            explanation.append(
-                f"    (all {source_capacity} units of outgoing capacity are used)"
-            )
-
+            source_note = _SOURCE_SATURATED_NOTE.format(source=source, **analysis)
         if sink_saturated:
-            explanation.append(f"  - The sink '{sink}' is fully saturated")
-            explanation.append(
-                f"    (all {sink_capacity} units of incoming capacity are used)"
-            )
-
-        explanation.append(
-            f"\n  The network bottleneck is {analysis['bottleneck']} units."
+            sink_note = _SINK_SATURATED_NOTE.format(sink=sink, **analysis)
+        analysis["explanation"] = _OPTIMAL_TEMPLATE.format(
+            source=source,
+            sink=sink,
+            source_note=source_note,
+            sink_note=sink_note,
+            **analysis,
         )
     else:
-        explanation.append("✗ OPTIMAL FLOW NOT ACHIEVED")
-        explanation.append(f"  - There is a discrepancy between max flow and min cut")
-        explanation.append(f"  - This may indicate an error in the calculation")
-
-    explanation.append(f"{'=' * 70}\n")
-
-    analysis["explanation"] = "\n".join(explanation)
+        analysis["explanation"] = _NONOPTIMAL_TEMPLATE.format(
+            source=source, sink=sink, **analysis
+        )
 
     return analysis
 
 
-def analyze_network_flow(G, sources, sinks):
+def analyze_network_flow(G, sources, sinks, verbose=False):
     """
     Analyzes the overall network flow for all source-sink pairs.
 
@@ -124,48 +457,44 @@ def analyze_network_flow(G, sources, sinks):
         G: NetworkX DiGraph
         sources: List of source node names
         sinks: List of sink node names
+        verbose: Print the capacity summary
 
     Returns:
         dict: Comprehensive analysis of the network
     """
+    node_index, out_capacity, in_capacity = _capacity_in_out(G, arrays=True)
+    source_idx = np.fromiter(
+        (node_index[source] for source in sources), dtype=np.int64, count=len(sources)
+    )
+    sink_idx = np.fromiter(
+        (node_index[sink] for sink in sinks), dtype=np.int64, count=len(sinks)
+    )
+
+    # Total capacity from all sources and to all sinks, one reduction each
+    source_total = out_capacity[source_idx].sum().item()
+    sink_total = in_capacity[sink_idx].sum().item()
+
     total_analysis = {
-        "source_total_capacity": 0,
-        "sink_total_capacity": 0,
-        "max_possible_flow": 0,
+        "source_total_capacity": source_total,
+        "sink_total_capacity": sink_total,
+        # The theoretical maximum flow is limited by the minimum of source and sink capacities
+        "max_possible_flow": min(source_total, sink_total),
     }
 
-    # Calculate total capacity from all sources
-    for source in sources:
-        capacity = sum(
-            G[source][neighbor]["capacity"] for neighbor in G.successors(source)
+    if verbose:
+        print(f"\n{'=' * 70}")
+        print("NETWORK CAPACITY ANALYSIS")
+        print(f"{'=' * 70}")
+        print(
+            f"Total capacity from all sources (terminals): {total_analysis['source_total_capacity']} units"
         )
-        total_analysis["source_total_capacity"] += capacity
-
-    # Calculate total capacity to all sinks
-    for sink in sinks:
-        capacity = sum(
-            G[predecessor][sink]["capacity"] for predecessor in G.predecessors(sink)
+        print(
+            f"Total capacity to all sinks (stores): {total_analysis['sink_total_capacity']} units"
         )
-        total_analysis["sink_total_capacity"] += capacity
-
-    # The theoretical maximum flow is limited by the minimum of source and sink capacities
-    total_analysis["max_possible_flow"] = min(
-        total_analysis["source_total_capacity"], total_analysis["sink_total_capacity"]
-    )
-
-    print(f"\n{'=' * 70}")
-    print("NETWORK CAPACITY ANALYSIS")
-    print(f"{'=' * 70}")
-    print(
-        f"Total capacity from all sources (terminals): {total_analysis['source_total_capacity']} units"
-    )
-    print(
-        f"Total capacity to all sinks (stores): {total_analysis['sink_total_capacity']} units"
-    )
-    print(
-        f"Theoretical maximum possible flow: {total_analysis['max_possible_flow']} units"
-    )
-    print(f"{'=' * 70}\n")
+        print(
+            f"Theoretical maximum possible flow: {total_analysis['max_possible_flow']} units"
+        )
+        print(f"{'=' * 70}\n")
 
     return total_analysis
 
@@ -184,108 +513,234 @@ def create_unified_network(G, sources, sinks):
         Modified graph with super source 'SUPER_SOURCE' and super sink 'SUPER_SINK'
     """
     G_unified = G.copy()
+    node_index, out_capacity, in_capacity = _capacity_in_out(G)
+
+    # The super nodes exist even if every edge below is pruned
+    G_unified.add_nodes_from(("SUPER_SOURCE", "SUPER_SINK"))
 
     # Add super source connected to all terminals with infinite capacity
-    # (since terminals themselves limit the flow)
+    # (since terminals themselves limit the flow). A terminal without
+    # outgoing capacity gets no edge, searches would only hit a dead end
     for source in sources:
-        capacity = sum(
-            G[source][neighbor]["capacity"] for neighbor in G.successors(source)
-        )
-        G_unified.add_edge("SUPER_SOURCE", source, capacity=capacity)
+        capacity = out_capacity[node_index[source]]
+        if capacity:
+            G_unified.add_edge("SUPER_SOURCE", source, capacity=capacity)
 
     # Add super sink connected from all stores with infinite capacity
-    # (since stores themselves limit the incoming flow)
+    # (since stores themselves limit the incoming flow), skipping stores
+    # without incoming capacity the same way
     for sink in sinks:
-        capacity = sum(
-            G[predecessor][sink]["capacity"] for predecessor in G.predecessors(sink)
-        )
-        G_unified.add_edge(sink, "SUPER_SINK", capacity=capacity)
+        capacity = in_capacity[node_index[sink]]
+        if capacity:
+            G_unified.add_edge(sink, "SUPER_SINK", capacity=capacity)
 
     return G_unified
 
 
-def calculate_network_max_flow(G, sources, sinks):
+def _synced_unified_entry(G, key, state):
     """
-    Calculates the maximum flow for the ENTIRE logistics network.
-    This treats all terminals and stores as a unified system.
+    Returns the cached unified network entry for key, brought up to date.
+
+    Capacity changes made to G since the entry was stored, through
+    set_edge_capacity() or not, are found by comparing edge states and
+    carried over to its unified network here, on the next query, instead
+    of on every write. Returns None when there is no entry or the nodes or
+    edges of G changed, the network has to be rebuilt then.
+
+    Args:
+        G: NetworkX DiGraph (original network)
+        key: (sources, sinks, flow_func) of the entry
+        state: Current _edge_state(G)
+    """
+    cache = _graph_cache(G).get("unified")
+    entry = None if cache is None else cache.get(key)
+    if entry is None:
+        return None
+    # Every hit makes the entry the most recently used one
+    cache.move_to_end(key)
+    if entry["state"] == state:
+        return entry
+
+    (old_nodes, old_edges), (nodes, edge_list) = entry["state"], state
+    if old_nodes != nodes or len(old_edges) != len(edge_list):
+        return None
+    changes = []
+    for (u, v, old), (x, y, new) in zip(old_edges, edge_list):
+        if u != x or v != y:
+            return None
+        if new != old:
+            changes.append((u, v, new - old))
+
+    _repair_unified_flow(entry, key[0], key[1], changes)
+    entry["state"] = state
+    return entry
+
+
+def _repair_unified_flow(entry, sources, sinks, changes):
+    """
+    Applies capacity changes of G to a cached unified network and its flow.
+
+    The edge and the super edges whose capacity follows it are updated, a
+    super edge pruned at zero capacity is added back once it has capacity.
+    The cached maximum flow is then repaired in place instead of being
+    recomputed from zero: flow above a lowered capacity is cancelled, then
+    the flow is augmented until it is maximum again.
+
+    Args:
+        entry: Cached unified network entry, modified in place
+        sources: Source nodes of the unified network
+        sinks: Sink nodes of the unified network
+        changes: (source, target, delta) for every edge of G whose
+            capacity changed by delta
+    """
+    G_unified, flow = entry["graph"], entry["flow"]
+    for source, target, delta in changes:
+        changed = [(source, target)]
+        if source in sources:
+            changed.append(("SUPER_SOURCE", source))
+        if target in sinks:
+            changed.append((target, "SUPER_SINK"))
+
+        for u, v in changed:
+            if v not in G_unified.succ[u]:
+                # A super edge pruned at zero capacity, it can only grow
+                if delta > 0:
+                    G_unified.add_edge(u, v, capacity=delta)
+                    flow[u][v] = 0
+                continue
+            capacity = G_unified.succ[u][v]["capacity"] + delta
+            set_edge_capacity(G_unified, u, v, capacity)
+            entry["max_flow"] -= shrink_edge_flow(
+                G_unified, flow, "SUPER_SOURCE", "SUPER_SINK", u, v
+            )
+    entry["max_flow"] += augment_to_max(G_unified, flow, "SUPER_SOURCE", "SUPER_SINK")
+
+
+def _unified_max_flow(G, sources, sinks, flow_func):
+    """
+    Returns (G_unified, max_flow, flow_dict) for the super source/sink network.
+
+    Results are kept in an LRU cache per sources, sinks and solver, at
+    most UNIFIED_CACHE_SIZE entries per graph. Capacity changes are
+    repaired incrementally on the next call, any other change to G makes
+    the entry stale and it is rebuilt from scratch. The returned flow_dict
+    is a copy, the cached flow stays private.
+    """
+    cache = _graph_cache(G).setdefault("unified", OrderedDict())
+    key = (tuple(sources), tuple(sinks), flow_func)
+    state = _edge_state(G)
+    entry = _synced_unified_entry(G, key, state)
+
+    if entry is None:
+        # Create unified network with super source and super sink
+        G_unified = create_unified_network(G, sources, sinks)
+
+        # Calculate maximum flow from super source to super sink
+        if isinstance(flow_func, str):
+            max_flow, flow = csr_maximum_flow(
+                G_unified, "SUPER_SOURCE", "SUPER_SINK", flow_func
+            )
+        else:
+            max_flow, flow = nx.maximum_flow(
+                G_unified,
+                "SUPER_SOURCE",
+                "SUPER_SINK",
+                flow_func=flow_func,
+            )
+
+        entry = {
+            "graph": G_unified,
+            "flow": flow,
+            "max_flow": max_flow,
+            "state": state,
+        }
+        cache[key] = entry
+        cache.move_to_end(key)
+        if len(cache) > UNIFIED_CACHE_SIZE:
+            cache.popitem(last=False)
+
+    flow_dict = {u: dict(nbrs) for u, nbrs in entry["flow"].items()}
+    return entry["graph"], entry["max_flow"], flow_dict
+
+
+def calculate_network_max_flow_value(
+    G, sources, sinks, flow_func=nx.algorithms.flow.preflow_push
+):
+    """
+    Calculates only the maximum flow value of the ENTIRE logistics network.
+
+    Unlike calculate_network_max_flow() no flow dictionary or optimality
+    analysis is built. NetworkX solvers run with
+    nx.maximum_flow_value, which for preflow_push skips the second phase
+    that turns the preflow into a flow, CSR solvers with
+    csr_maximum_flow_value().
 
     Args:
         G: NetworkX DiGraph (original network)
         sources: List of source node names (terminals)
         sinks: List of sink node names (stores)
+        flow_func: Same as for calculate_network_max_flow()
 
     Returns:
-        dict: Contains max flow value, flow distribution, and optimality analysis
+        The maximum flow value
     """
-    # Create unified network with super source and super sink
-    G_unified = create_unified_network(G, sources, sinks)
+    # A flow cached by calculate_network_max_flow() already has the value
+    key = (tuple(sources), tuple(sinks), flow_func)
+    entry = _synced_unified_entry(G, key, _edge_state(G))
+    if entry is not None:
+        return entry["max_flow"]
 
-    # Calculate maximum flow from super source to super sink
-    max_flow, flow_dict = nx.maximum_flow(
-        G_unified,
-        "SUPER_SOURCE",
-        "SUPER_SINK",
-        flow_func=nx.algorithms.flow.edmonds_karp,
+    G_unified = create_unified_network(G, sources, sinks)
+    if isinstance(flow_func, str):
+        return csr_maximum_flow_value(
+            G_unified, "SUPER_SOURCE", "SUPER_SINK", flow_func
+        )
+    return nx.maximum_flow_value(
+        G_unified, "SUPER_SOURCE", "SUPER_SINK", flow_func=flow_func
     )
 
+
+def calculate_network_max_flow(
+    G,
+    sources,
+    sinks,
+    flow_func=nx.algorithms.flow.preflow_push,
+    explain=False,
+):
+    """
+    Calculates the maximum flow for the ENTIRE logistics network.
+    This treats all terminals and stores as a unified system.
+
+    Args:
+        G: NetworkX DiGraph (original network)
+        sources: List of source node names (terminals)
+        sinks: List of sink node names (stores)
+        flow_func: NetworkX flow function (preflow_push by default,
+            boykov_kolmogorov suits graphs with skewed, grid-like
+            structure), or the name of a CSR solver ("dinic",
+            "edmonds_karp", "push_relabel", "auto")
+        explain: Include the printable optimality report in the analysis
+
+    Returns:
+        dict: Contains max flow value, optimality analysis, the unified
+            graph and its flow dictionary
+    """
+    G_unified, max_flow, flow_dict = _unified_max_flow(G, sources, sinks, flow_func)
+
     # Analyze optimality for the entire network
-    analysis = check_optimal_flow(G_unified, "SUPER_SOURCE", "SUPER_SINK", max_flow)
-
-    # Extract actual terminal-to-store flows from the flow dictionary
-    # We need to properly attribute flow from each terminal to each store
-    # accounting for shared warehouses
-    terminal_store_flows = []
-
-    for terminal in sources:
-        terminal_total_flow = flow_dict.get("SUPER_SOURCE", {}).get(terminal, 0)
-        if terminal_total_flow > 0:
-            # For each warehouse connected to this terminal
-            for warehouse in G.successors(terminal):
-                terminal_to_warehouse = flow_dict.get(terminal, {}).get(warehouse, 0)
-
-                if terminal_to_warehouse > 0:
-                    # Calculate total outgoing flow from this warehouse
-                    warehouse_total_out = sum(
-                        flow_dict.get(warehouse, {}).get(s, 0)
-                        for s in G.successors(warehouse)
-                    )
-
-                    if warehouse_total_out > 0:
-                        # For each store connected to this warehouse
-                        for store in G.successors(warehouse):
-                            warehouse_to_store = flow_dict.get(warehouse, {}).get(
-                                store, 0
-                            )
-
-                            if warehouse_to_store > 0:
-                                # Proportionally attribute the store flow to this terminal
-                                # based on how much this terminal contributes to the warehouse
-                                total_warehouse_in = sum(
-                                    flow_dict.get(t, {}).get(warehouse, 0)
-                                    for t in sources
-                                )
-
-                                if total_warehouse_in > 0:
-                                    proportion = (
-                                        terminal_to_warehouse / total_warehouse_in
-                                    )
-                                    attributed_flow = warehouse_to_store * proportion
-
-                                    if (
-                                        attributed_flow > 0.01
-                                    ):  # Only include significant flows
-                                        terminal_store_flows.append(
-                                            (terminal, store, attributed_flow)
-                                        )
+    analysis = check_optimal_flow(
+        G_unified, "SUPER_SOURCE", "SUPER_SINK", max_flow, flow_dict, explain
+    )
 
-    return {
+    result = {
         "max_flow": max_flow,
-        "flow_distribution": terminal_store_flows,
         "optimality_analysis": analysis,
         "graph": G_unified,
         "flow_dict": flow_dict,
     }
 
+    return result
+
 
 def get_edges_list(G):
     """
@@ -297,10 +752,7 @@ def get_edges_list(G):
     Returns:
         list: List of tuples (source, target, capacity)
     """
-    edges = []
-    for u, v, data in G.edges(data=True):
-        edges.append((u, v, data.get("capacity", 0)))
-    return edges
+    return list(G.edges(data="capacity", default=0))
 
 
 def validate_edge(G, edge_name):
@@ -314,14 +766,12 @@ def validate_edge(G, edge_name):
     Returns:
         tuple: (is_valid, source, target) or (False, None, None)
     """
-    if "->" not in edge_name:
-        return False, None, None
-
-    parts = edge_name.split("->")
-    if len(parts) != 2:
+    # One pass up to the first arrow, a second arrow makes the name invalid
+    left, sep, right = edge_name.partition("->")
+    if not sep or "->" in right:
         return False, None, None
 
-    source, target = parts[0].strip(), parts[1].strip()
+    source, target = left.strip(), right.strip()
 
     if G.has_edge(source, target):
         return True, source, target
@@ -354,8 +804,7 @@ def update_edge_capacity(G, source, target, new_capacity):
             "message": f"Capacity must be positive, got {new_capacity}",
         }
 
-    old_capacity = G[source][target]["capacity"]
-    G[source][target]["capacity"] = new_capacity
+    old_capacity = set_edge_capacity(G, source, target, new_capacity)
 
     return {
         "success": True,
@@ -365,6 +814,27 @@ def update_edge_capacity(G, source, target, new_capacity):
     }
 
 
+def set_edge_capacity(G, source, target, new_capacity):
+    """
+    Sets the capacity of an existing edge without any validation.
+
+    Args:
+        G: NetworkX DiGraph
+        source: Source node, the edge source -> target must exist
+        target: Target node
+        new_capacity: New capacity value
+
+    Returns:
+        The previous capacity of the edge
+    """
+    # The edge attribute dict straight from the adjacency store, G[u][v]
+    # would build two view objects to reach the same dict
+    attrs = G._adj[source][target]
+    old_capacity = attrs["capacity"]
+    attrs["capacity"] = new_capacity
+    return old_capacity
+
+
 def get_edge_autocomplete_list(G):
     """
     Returns a list of edge names for autocomplete in format "source->target".
@@ -375,10 +845,7 @@ def get_edge_autocomplete_list(G):
     Returns:
         list: List of edge names
     """
-    edges = []
-    for u, v in G.edges():
-        edges.append(f"{u} -> {v}")
-    return edges
+    return [f"{u} -> {v}" for u, v in G.edges()]
 
 
 def get_current_state(G):
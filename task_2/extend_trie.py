@@ -1,7 +1,192 @@
+from collections import Counter
+
 from pygtrie import Trie
 
 
-class Homework(Trie):
+class _CountingTrie(Trie):
+    """Trie that knows how many of its words start with each prefix.
+
+    A Counter maps the path of every prefix of every word to the number of
+    words starting with it. The mutators below keep it up to date through
+    the public Trie API only (update() and the constructor go through
+    __setitem__), so it does not depend on how pygtrie stores its nodes.
+    """
+
+    def __init__(self, *args, **kwargs):
+        # Must exist before Trie.__init__() inserts the initial items
+        self._prefix_counts = Counter()
+        super().__init__(*args, **kwargs)
+
+    @staticmethod
+    def _split_slice(key_or_slice):
+        """Return (key, is_slice) the way Trie reads t[key] and t[key:]."""
+        if not isinstance(key_or_slice, slice):
+            return key_or_slice, False
+        if key_or_slice.stop is not None or key_or_slice.step is not None:
+            raise TypeError(key_or_slice)
+        return key_or_slice.start, True
+
+    def _prefixes(self, key) -> list:
+        """Return the paths of all prefixes of key, from () to key itself."""
+        path = tuple(self._path_from_key(key))
+        return [path[:i] for i in range(len(path) + 1)]
+
+    def _count(self, key, delta) -> None:
+        """Add delta to the count of every prefix of key."""
+        counts = self._prefix_counts
+        for prefix in self._prefixes(key):
+            count = counts[prefix] + delta
+            if count:
+                counts[prefix] = count
+            else:
+                del counts[prefix]
+
+    def _recount(self) -> None:
+        """Rebuild all counts in one post-order walk over the nodes."""
+        counts = Counter()
+
+        def count_node(path_conv, path, children, *value):
+            # value is only passed for nodes that hold a word
+            count = len(value) + sum(children)
+            if count:
+                counts[path] = count
+            return count
+
+        self.traverse(count_node)
+        self._prefix_counts = counts
+
+    def _subtrie_keys(self, key) -> list:
+        """Return all keys starting with key, including key itself."""
+        if not self.has_node(key):
+            return []
+        return list(self.iterkeys(prefix=key))
+
+    def _copied(self, cpy):
+        """Give a copy made by Trie its own counts, Trie shares __dict__ entries."""
+        cpy._prefix_counts = self._prefix_counts.copy()
+        return cpy
+
+    def count_with_prefix(self, prefix) -> int:
+        """Return the number of words starting with prefix in O(|prefix|)."""
+        return self._prefix_counts[tuple(self._path_from_key(prefix))]
+
+    def __len__(self) -> int:
+        return self._prefix_counts[()]
+
+    def __setitem__(self, key_or_slice, value) -> None:
+        key, is_slice = self._split_slice(key_or_slice)
+        if is_slice:
+            # t[key:] = value drops the whole subtrie of key
+            for removed in self._subtrie_keys(key):
+                self._count(removed, -1)
+        elif self.has_key(key):
+            super().__setitem__(key, value)
+            return
+        super().__setitem__(key_or_slice, value)
+        self._count(key, 1)
+
+    def __delitem__(self, key_or_slice) -> None:
+        key, is_slice = self._split_slice(key_or_slice)
+        if is_slice:
+            removed = self._subtrie_keys(key)
+        else:
+            removed = [key] if self.has_key(key) else []
+        super().__delitem__(key_or_slice)
+        for key in removed:
+            self._count(key, -1)
+
+    def setdefault(self, key, default=None):
+        if self.has_key(key):
+            return self[key]
+        super().setdefault(key, default)
+        self._count(key, 1)
+        return default
+
+    def pop(self, key, *default):
+        if self.has_key(key):
+            self._count(key, -1)
+        return super().pop(key, *default)
+
+    def popitem(self):
+        if not self:
+            raise KeyError()
+        key = next(self.iterkeys())
+        return key, self.pop(key)
+
+    def clear(self) -> None:
+        super().clear()
+        self._prefix_counts = Counter()
+
+    def merge(self, other, overwrite=False) -> None:
+        super().merge(other, overwrite)
+        self._recount()
+
+    # pygtrie 2.5 builds __copy__() and __deepcopy__() on copy(make_copy),
+    # later versions on a private helper, so all three are wrapped
+    def copy(self, *args):
+        return self._copied(super().copy(*args))
+
+    def __copy__(self):
+        return self._copied(super().__copy__())
+
+    def __deepcopy__(self, memo):
+        return self._copied(super().__deepcopy__(memo))
+
+
+class Homework(_CountingTrie):
+    """Trie with suffix counting and prefix checks.
+
+    Every key is mirrored reversed into a second trie, so a suffix query is
+    a prefix query there and never scans all the words. Both tries keep
+    per-prefix word counts, so neither query iterates over matches.
+    """
+
+    def __init__(self, *args, **kwargs):
+        # Must exist before Trie.__init__() inserts the initial items
+        self._reversed = _CountingTrie()
+        super().__init__(*args, **kwargs)
+
+    def _unmirror(self, keys) -> None:
+        """Remove keys from the reversed trie."""
+        for key in keys:
+            del self._reversed[key[::-1]]
+
+    def _copied(self, cpy):
+        cpy = super()._copied(cpy)
+        cpy._reversed = self._reversed.copy()
+        return cpy
+
+    def __setitem__(self, key_or_slice, value) -> None:
+        key, is_slice = self._split_slice(key_or_slice)
+        if is_slice:
+            self._unmirror(self._subtrie_keys(key))
+        super().__setitem__(key_or_slice, value)
+        self._reversed[key[::-1]] = True
+
+    def __delitem__(self, key_or_slice) -> None:
+        key, is_slice = self._split_slice(key_or_slice)
+        removed = self._subtrie_keys(key) if is_slice else [key]
+        super().__delitem__(key_or_slice)
+        self._unmirror(removed)
+
+    def setdefault(self, key, default=None):
+        if not self.has_key(key):
+            self._reversed[key[::-1]] = True
+        return super().setdefault(key, default)
+
+    def pop(self, key, *default):
+        if self.has_key(key):
+            self._unmirror([key])
+        return super().pop(key, *default)
+
+    def clear(self) -> None:
+        super().clear()
+        self._reversed.clear()
+
+    def merge(self, other, overwrite=False) -> None:
+        super().merge(other, overwrite)
+        self._reversed = _CountingTrie((key[::-1], True) for key in self.iterkeys())
+
     def count_words_with_suffix(self, pattern) -> int:
         """Count the number of words ending with a given pattern.
 
@@ -19,21 +204,11 @@ class Homework(Trie):
 
         # Handle empty pattern - counts all words
         if not pattern:
-            return sum(1 for _ in self.iterkeys())
-
-        count = 0
-        # Convert pattern to internal path representation
-        pattern_path = tuple(self._path_from_key(pattern))
-        pattern_len = len(pattern_path)
+            return len(self)
 
-        # Iterate through all keys and check if they end with the pattern
-        for key in self.iterkeys():
-            key_path = tuple(self._path_from_key(key))
-            # Check if key ends with pattern
-            if len(key_path) >= pattern_len and key_path[-pattern_len:] == pattern_path:
-                count += 1
-
-        return count
+        # Words ending with the pattern are the words of the reversed trie
+        # starting with the reversed pattern
+        return self._reversed.count_with_prefix(pattern[::-1])
 
     def has_prefix(self, prefix) -> bool:
         """Check if there is at least one word with the given prefix.
@@ -52,16 +227,11 @@ class Homework(Trie):
 
         # Empty prefix matches all words
         if not prefix:
-            return bool(list(self.iterkeys()))
-
-        try:
-            # Try to navigate to the prefix node
-            node, _ = self._get_node(prefix)
-            # If we reach here, the prefix exists as a node in the trie
-            return True
-        except KeyError:
-            # Prefix path doesn't exist in trie
-            return False
+            return bool(self)
+
+        # has_node() is non-zero when the prefix node has a value or a
+        # subtrie, the same as has_key() or has_subtrie() in one descent
+        return self.has_node(prefix) != 0
 
 
 if __name__ == "__main__":
@@ -0,0 +1,115 @@
+"""
+Tests for the prefix and suffix counts of the Homework trie.
+
+After every mutation the counts are compared with a brute-force count over
+the stored words.
+"""
+
+import copy
+import pickle
+import random
+import unittest
+
+from pygtrie import Trie
+
+from task_2.extend_trie import Homework
+
+ALPHABET = "abc"
+
+
+def random_word(rng, max_length=4):
+    return "".join(rng.choices(ALPHABET, k=rng.randint(1, max_length)))
+
+
+def all_prefixes(max_length=4):
+    """Every string over ALPHABET up to max_length, including ""."""
+    prefixes = [""]
+    for prefix in prefixes:
+        if len(prefix) < max_length:
+            prefixes.extend(prefix + char for char in ALPHABET)
+    return prefixes
+
+
+class HomeworkTest(unittest.TestCase):
+    def assert_counts(self, trie):
+        """Check len and every prefix and suffix query against brute force."""
+        words = ["".join(key) for key in trie.iterkeys()]
+        self.assertEqual(len(trie), len(words))
+        for affix in all_prefixes():
+            with self.subTest(affix=affix):
+                starting = sum(word.startswith(affix) for word in words)
+                ending = sum(word.endswith(affix) for word in words)
+                self.assertEqual(trie.count_with_prefix(affix), starting)
+                self.assertEqual(trie.count_words_with_suffix(affix), ending)
+                self.assertEqual(trie.has_prefix(affix), starting > 0)
+
+    def mutate(self, rng, trie):
+        """Apply one random mutation through the public Trie API."""
+        word = random_word(rng)
+        operation = rng.randrange(9)
+        if operation == 0:
+            trie[word] = rng.random()
+        elif operation == 1:
+            trie.setdefault(word, 1)
+        elif operation == 2:
+            trie.update({random_word(rng): 2 for _ in range(3)}, x=3)
+        elif operation == 3:
+            if trie.has_key(word):
+                del trie[word]
+        elif operation == 4:
+            # Slices work on a subtrie, which may not exist
+            if trie.has_node(word[:2]):
+                del trie[word[:2] :]
+        elif operation == 5:
+            trie[word[:2] :] = 4
+        elif operation == 6:
+            trie.pop(word, None)
+        elif operation == 7:
+            if trie:
+                trie.popitem()
+        else:
+            other = Homework if rng.random() < 0.5 else Trie
+            other = other((random_word(rng), 5) for _ in range(3))
+            trie.merge(other, overwrite=rng.random() < 0.5)
+            self.assertEqual(len(other), 0)
+
+    def test_counts_follow_random_mutations(self):
+        for seed in range(30):
+            rng = random.Random(seed)
+            trie = Homework((random_word(rng), 0) for _ in range(rng.randint(0, 8)))
+            for step in range(40):
+                self.mutate(rng, trie)
+                with self.subTest(seed=seed, step=step):
+                    self.assert_counts(trie)
+
+    def test_copies_are_independent(self):
+        rng = random.Random(1)
+        trie = Homework((random_word(rng), 0) for _ in range(10))
+        copies = [
+            trie.copy(),
+            copy.copy(trie),
+            copy.deepcopy(trie),
+            pickle.loads(pickle.dumps(trie)),
+        ]
+        for cpy in copies:
+            words = set(cpy.keys())
+            for _ in range(20):
+                self.mutate(rng, trie)
+            with self.subTest(copy=type(cpy).__name__):
+                self.assertEqual(set(cpy.keys()), words)
+                self.assert_counts(cpy)
+                self.assert_counts(trie)
+
+    def test_clear(self):
+        trie = Homework(apple=1, app=2, banana=3)
+        trie.clear()
+        self.assert_counts(trie)
+        trie["cab"] = 1
+        self.assert_counts(trie)
+
+    def test_rejects_non_string_queries(self):
+        trie = Homework(apple=1)
+        with self.assertRaises(TypeError):
+            trie.count_words_with_suffix(1)
+        with self.assertRaises(TypeError):
+            trie.has_prefix(None)
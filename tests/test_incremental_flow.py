@@ -0,0 +1,179 @@
+"""
+Tests for the incremental max-flow repair of the cached unified networks.
+
+Every repaired or rebuilt result is compared with a fresh
+nx.maximum_flow_value on the same graph.
+"""
+
+import random
+import unittest
+
+import networkx as nx
+
+from task_1.logistics_network_simulator import utils
+from task_1.logistics_network_simulator.incremental_flow import (
+    augment_to_max,
+    cancel_flow,
+    shrink_edge_flow,
+)
+
+FLOW_FUNCS = (nx.algorithms.flow.preflow_push, "dinic", "edmonds_karp")
+
+
+def random_network(seed):
+    """Random graph with integer capacities, two sources and three sinks."""
+    rng = random.Random(seed)
+    num_nodes = rng.randint(6, 16)
+    G = nx.gnm_random_graph(
+        num_nodes, rng.randint(num_nodes, 4 * num_nodes), directed=True, seed=seed
+    )
+    for u, v in G.edges():
+        G[u][v]["capacity"] = rng.choice((0, 0, rng.randint(1, 12)))
+    nodes = list(G)
+    sources = rng.sample(nodes, 2)
+    sinks = rng.sample([node for node in nodes if node not in sources], 3)
+    return rng, G, sources, sinks
+
+
+def fresh_value(G, sources, sinks):
+    """Max flow of the unified network built from scratch, without caches."""
+    G_unified = utils.create_unified_network(G, sources, sinks)
+    return nx.maximum_flow_value(G_unified, "SUPER_SOURCE", "SUPER_SINK")
+
+
+class FlowAssertions:
+    def assert_feasible(self, G, flow, source, sink, value):
+        """Check capacity limits, conservation and the flow value."""
+        for u, v, capacity in G.edges(data="capacity"):
+            self.assertGreaterEqual(flow[u][v], 0)
+            self.assertLessEqual(flow[u][v], capacity)
+        for node in G:
+            net_out = sum(flow[node].values()) - sum(
+                flow[w][node] for w in G.pred[node]
+            )
+            if node == source:
+                self.assertEqual(net_out, value)
+            elif node == sink:
+                self.assertEqual(net_out, -value)
+            else:
+                self.assertEqual(net_out, 0)
+
+
+class IncrementalFlowTest(FlowAssertions, unittest.TestCase):
+    def test_augment_to_max_from_zero_flow(self):
+        for seed in range(40):
+            _, G, (source, _), (sink, *_) = random_network(seed)
+            flow = {u: dict.fromkeys(G[u], 0) for u in G}
+            with self.subTest(seed=seed):
+                added = augment_to_max(G, flow, source, sink)
+                self.assertEqual(added, nx.maximum_flow_value(G, source, sink))
+                self.assert_feasible(G, flow, source, sink, added)
+
+    def test_raise_and_lower_capacities(self):
+        for seed in range(40):
+            rng, G, (source, _), (sink, *_) = random_network(seed)
+            value, flow = nx.maximum_flow(G, source, sink)
+            for step in range(10):
+                u, v = rng.choice(list(G.edges()))
+                G[u][v]["capacity"] = rng.randint(0, 15)
+                with self.subTest(seed=seed, step=step):
+                    value -= shrink_edge_flow(G, flow, source, sink, u, v)
+                    self.assert_feasible(G, flow, source, sink, value)
+                    value += augment_to_max(G, flow, source, sink)
+                    self.assertEqual(value, nx.maximum_flow_value(G, source, sink))
+                    self.assert_feasible(G, flow, source, sink, value)
+
+    def test_cancel_flow_stops_at_amount(self):
+        G = nx.DiGraph()
+        G.add_edge("s", "a", capacity=5)
+        G.add_edge("a", "t", capacity=5)
+        flow = {"s": {"a": 5}, "a": {"t": 5}, "t": {}}
+        self.assertEqual(cancel_flow(G, flow, "s", "t", 3), 3)
+        self.assertEqual(flow, {"s": {"a": 2}, "a": {"t": 2}, "t": {}})
+        self.assertEqual(cancel_flow(G, flow, "s", "t", 10), 2)
+
+
+class UnifiedCacheTest(FlowAssertions, unittest.TestCase):
+    def assert_matches_fresh(self, G, sources, sinks, flow_func):
+        """Check the cached results against a from-scratch max flow."""
+        expected = fresh_value(G, sources, sinks)
+        self.assertEqual(
+            utils.calculate_network_max_flow_value(G, sources, sinks, flow_func),
+            expected,
+        )
+        result = utils.calculate_network_max_flow(G, sources, sinks, flow_func)
+        self.assertEqual(result["max_flow"], expected)
+        self.assertTrue(result["optimality_analysis"]["is_optimal"])
+        self.assert_feasible(
+            result["graph"], result["flow_dict"], "SUPER_SOURCE", "SUPER_SINK", expected
+        )
+        return result
+
+    def test_capacity_changes_are_repaired_in_place(self):
+        for seed in range(60):
+            rng, G, sources, sinks = random_network(seed)
+            flow_func = FLOW_FUNCS[seed % len(FLOW_FUNCS)]
+            G_unified = self.assert_matches_fresh(G, sources, sinks, flow_func)["graph"]
+            for step in range(8):
+                # Raise and lower capacities, through set_edge_capacity() and
+                # through direct attribute writes
+                for _ in range(rng.randint(1, 3)):
+                    u, v = rng.choice(list(G.edges()))
+                    if rng.random() < 0.5:
+                        utils.set_edge_capacity(G, u, v, rng.randint(0, 15))
+                    else:
+                        G[u][v]["capacity"] = rng.randint(0, 15)
+                with self.subTest(seed=seed, step=step):
+                    result = self.assert_matches_fresh(G, sources, sinks, flow_func)
+                    # Same unified network, repaired instead of rebuilt
+                    self.assertIs(result["graph"], G_unified)
+
+    def test_edge_changes_rebuild_the_network(self):
+        for seed in range(40):
+            rng, G, sources, sinks = random_network(seed)
+            flow_func = FLOW_FUNCS[seed % len(FLOW_FUNCS)]
+            self.assert_matches_fresh(G, sources, sinks, flow_func)
+            for step in range(6):
+                if rng.random() < 0.5:
+                    G.remove_edge(*rng.choice(list(G.edges())))
+                a, b = rng.sample(list(G), 2)
+                G.add_edge(a, b, capacity=rng.randint(0, 12))
+                with self.subTest(seed=seed, step=step):
+                    self.assert_matches_fresh(G, sources, sinks, flow_func)
+
+    def test_edge_swap_with_equal_counts(self):
+        for flow_func in FLOW_FUNCS:
+            G = nx.DiGraph()
+            G.add_edge("s", "a", capacity=5)
+            G.add_edge("a", "t", capacity=5)
+            G.add_edge("s", "b", capacity=1)
+            with self.subTest(flow_func=flow_func):
+                self.assertEqual(
+                    self.assert_matches_fresh(G, ["s"], ["t"], flow_func)["max_flow"], 5
+                )
+                G.remove_edge("a", "t")
+                G.add_edge("b", "t", capacity=7)
+                self.assertEqual(
+                    self.assert_matches_fresh(G, ["s"], ["t"], flow_func)["max_flow"], 1
+                )
+
+    def test_cache_evicts_least_recently_used(self):
+        G = nx.gnm_random_graph(16, 60, directed=True, seed=3)
+        for u, v in G.edges():
+            G[u][v]["capacity"] = (u * v) % 9 + 1
+        sources, sinks = [0, 1], list(range(2, 16))
+        keys = []
+        for sink in sinks[: utils.UNIFIED_CACHE_SIZE]:
+            utils.calculate_network_max_flow(G, sources, [sink], "dinic")
+            keys.append((tuple(sources), (sink,), "dinic"))
+
+        # A hit on the oldest entry keeps it over the second oldest
+        utils.calculate_network_max_flow_value(G, sources, [sinks[0]], "dinic")
+        utils.calculate_network_max_flow(
+            G, sources, [sinks[utils.UNIFIED_CACHE_SIZE]], "dinic"
+        )
+
+        cache = utils._graph_cache(G)["unified"]
+        self.assertEqual(len(cache), utils.UNIFIED_CACHE_SIZE)
+        self.assertIn(keys[0], cache)
+        self.assertNotIn(keys[1], cache)
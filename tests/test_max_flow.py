@@ -0,0 +1,173 @@
+"""
+Tests for the CSR max-flow kernels.
+
+Run from the repository root:
+
+    python -m unittest discover -s tests
+
+The kernels are compiled with Numba when it is installed. The
+WithoutNumba case runs this module again with NUMBA_DISABLE_JIT=1, so
+both the compiled and the plain Python code are checked.
+"""
+
+import os
+import random
+import subprocess
+import sys
+import unittest
+from unittest import mock
+
+import networkx as nx
+import numpy as np
+
+from task_1.logistics_network_simulator import utils
+from task_1.logistics_network_simulator.dinic import dinic
+from task_1.logistics_network_simulator.jit import HAS_NUMBA
+from task_1.logistics_network_simulator.push_relabel import push_relabel
+from task_1.logistics_network_simulator.utils import prepare_capacity_csr
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def random_network(seed, num_nodes=12, density=0.3, max_capacity=20):
+    """Random directed graph with integer capacities, some of them zero."""
+    rng = random.Random(seed)
+    G = nx.gnp_random_graph(num_nodes, density, directed=True, seed=seed)
+    for u, v in G.edges():
+        G[u][v]["capacity"] = rng.randint(0, max_capacity)
+    return G
+
+
+class SolverTestMixin:
+    """Checks shared by all CSR solvers, solver is set by the test case."""
+
+    solver = None
+
+    def run_solver(self, G, source, sink):
+        """Run the solver on G, return its result and the CSR arrays."""
+        csr = prepare_capacity_csr(G)
+        node_index = {node: i for i, node in enumerate(G)}
+        result = type(self).solver(*csr, node_index[source], node_index[sink])
+        return result, csr, node_index
+
+    def assert_feasible(self, result, csr, source, sink):
+        """Check capacity limits, antisymmetry and flow conservation."""
+        indptr, _, cap, rev = csr
+        flow = result["flow"]
+        self.assertTrue(np.all(flow <= cap))
+        np.testing.assert_array_equal(flow[rev], -flow)
+
+        # Net outflow of every node, each arc holds flow leaving its tail
+        tails = np.repeat(np.arange(indptr.size - 1), np.diff(indptr))
+        net_out = np.zeros(indptr.size - 1, dtype=np.int64)
+        np.add.at(net_out, tails, flow)
+        expected = np.zeros_like(net_out)
+        if source != sink:
+            expected[source] = result["max_flow"]
+            expected[sink] = -result["max_flow"]
+        np.testing.assert_array_equal(net_out, expected)
+
+    def test_matches_networkx_on_random_graphs(self):
+        for seed in range(60):
+            G = random_network(seed, density=0.15 + (seed % 5) * 0.1)
+            source, sink = 0, len(G) - 1
+            with self.subTest(seed=seed):
+                result, csr, node_index = self.run_solver(G, source, sink)
+                self.assertEqual(
+                    result["max_flow"], nx.maximum_flow_value(G, source, sink)
+                )
+                self.assert_feasible(result, csr, node_index[source], node_index[sink])
+
+    def test_source_equals_sink(self):
+        G = random_network(7)
+        result, _, _ = self.run_solver(G, 3, 3)
+        self.assertEqual(result["max_flow"], 0)
+        self.assertFalse(np.any(result["flow"]))
+
+    def test_unreachable_sink(self):
+        G = random_network(11)
+        G.add_edge("sink", 0, capacity=5)
+        result, csr, node_index = self.run_solver(G, 0, "sink")
+        self.assertEqual(result["max_flow"], 0)
+        self.assert_feasible(result, csr, node_index[0], node_index["sink"])
+
+
+class DinicTest(SolverTestMixin, unittest.TestCase):
+    solver = dinic
+
+
+class PushRelabelTest(SolverTestMixin, unittest.TestCase):
+    solver = push_relabel
+
+    def test_dense_graphs(self):
+        # Dense graphs trigger many relabels, gaps and global relabels
+        for seed in range(20):
+            G = random_network(seed, num_nodes=25, density=0.6)
+            with self.subTest(seed=seed):
+                result, csr, node_index = self.run_solver(G, 0, 24)
+                self.assertEqual(result["max_flow"], nx.maximum_flow_value(G, 0, 24))
+                self.assert_feasible(result, csr, node_index[0], node_index[24])
+
+
+class CsrSolveTest(unittest.TestCase):
+    def solver_used(self, G, source, sink, flow_func):
+        """Run csr_maximum_flow() and return the name of the solver it ran."""
+        used = []
+
+        def recorder(name, func):
+            def record(*args):
+                used.append(name)
+                return func(*args)
+
+            return record
+
+        recording = {
+            name: recorder(name, func) for name, func in utils.CSR_FLOW_FUNCS.items()
+        }
+        with mock.patch.dict(utils.CSR_FLOW_FUNCS, recording):
+            max_flow, _ = utils.csr_maximum_flow(G, source, sink, flow_func)
+        self.assertEqual(max_flow, nx.maximum_flow_value(G, source, sink))
+        return used
+
+    def test_auto_picks_push_relabel_for_dense_graphs(self):
+        G = random_network(1, num_nodes=12, density=1.0)
+        self.assertGreater(
+            G.number_of_edges() / G.number_of_nodes(), utils.DENSE_GRAPH_RATIO
+        )
+        self.assertEqual(self.solver_used(G, 0, 11, "auto"), ["push_relabel"])
+
+    def test_auto_picks_dinic_for_sparse_graphs(self):
+        G = random_network(2, num_nodes=12, density=0.2)
+        self.assertLessEqual(
+            G.number_of_edges() / G.number_of_nodes(), utils.DENSE_GRAPH_RATIO
+        )
+        self.assertEqual(self.solver_used(G, 0, 11, "auto"), ["dinic"])
+
+    def test_fractional_capacities_fall_back_to_preflow_push(self):
+        G = random_network(3)
+        for u, v in G.edges():
+            G[u][v]["capacity"] /= 4
+        self.assertIsNone(utils._csr_solve(G, 0, 11, "dinic"))
+        self.assertEqual(self.solver_used(G, 0, 11, "dinic"), [])
+        self.assertAlmostEqual(
+            utils.csr_maximum_flow_value(G, 0, 11, "push_relabel"),
+            nx.maximum_flow_value(G, 0, 11),
+        )
+
+
+@unittest.skipIf(
+    not HAS_NUMBA or os.environ.get("NUMBA_DISABLE_JIT") == "1",
+    "Numba is not installed or already disabled",
+)
+class WithoutNumbaTest(unittest.TestCase):
+    def test_plain_python_kernels(self):
+        env = dict(os.environ, NUMBA_DISABLE_JIT="1")
+        completed = subprocess.run(
+            [sys.executable, "-m", "unittest", "tests.test_max_flow"],
+            cwd=ROOT,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        self.assertEqual(completed.returncode, 0, completed.stderr)